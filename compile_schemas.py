@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Generate the compiled DecklistResponse validator
+
+Writes src/models/_compiled_validators.py: a fastjsonschema validator,
+generated from DecklistResponse's JSON schema, for the response payload.
+Decklists are built without Pydantic validation (build_trusted), so in
+debug mode the API checks their serialized shape with this instead.
+
+Re-run whenever the decklist schemas change:
+    pip install fastjsonschema
+    python compile_schemas.py
+"""
+
+import os
+import sys
+
+import fastjsonschema
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.models.schemas import DecklistResponse  # noqa: E402
+
+OUTPUT_PATH = os.path.join('src', 'models', '_compiled_validators.py')
+
+
+def main():
+    schema = DecklistResponse.model_json_schema(mode='serialization')
+    code = fastjsonschema.compile_to_code(schema)
+
+    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), OUTPUT_PATH)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write('# Generated by compile_schemas.py from DecklistResponse - do not edit\n')
+        f.write(code)
+
+    print(f"✓ Wrote {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,82 +4,463 @@ Detect and crop metadata section using color detection
 Usage:
     python detect_metadata_boundary.py "image.jpg" --crop
     python detect_metadata_boundary.py "image.jpg" --crop --output metadata_crop.png
+    python detect_metadata_boundary.py "screenshots/"    # Batch: every image in folder
 """
+import os
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import numpy as np
 
+# Try to import numba for the JIT-compiled boundary scan
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Metadata extraction colors
 METADATA_BG_COLOR_HEX = '#1e3044'
 MAIN_DECK_BG_COLOR_HEX = '#013950'
 
+# Max distance to main deck color, compared squared (30 ** 2) to skip the sqrt
+MAIN_COLOR_THRESHOLD_SQ = 900
+
+# Sample 5 columns around sample_x_percent and require 3 to agree, so a single
+# column landing on an icon or artifact doesn't break detection
+SAMPLE_X_OFFSETS_PERCENT = (-2, -1, 0, 1, 2)
+MIN_COLUMN_VOTES = 3
+
+# Consecutive main_color rows needed to confirm the boundary
+REQUIRED_CONSECUTIVE = 5
+
+# Only runs starting in the top half are looked for - the metadata section
+# never reaches past it, so a screenshot without a clear boundary stops there
+# and takes the fallback instead of being scanned to the bottom
+MAX_SCAN_PERCENT = 50
+
+# Coarse probes (% of image height) used to bracket the boundary before the
+# fine scan; the boundary normally sits between 10% and 30%
+BISECT_PROBE_PERCENTS = (10, 15, 20, 25, 30, 40)
+BISECT_WINDOW_ROWS = 50
+
+# Tall screenshots are scanned at 1/4 resolution first - the boundary is a
+# solid color transition far thicker than 4px
+DOWNSCALE_FACTOR = 4
+DOWNSCALE_MIN_HEIGHT = 1500
+
 
 def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 
-def color_distance(c1, c2):
-    """Euclidean distance between two RGB colors"""
-    return sum((int(a) - int(b)) ** 2 for a, b in zip(c1, c2)) ** 0.5
+# Parse the reference colors once at import instead of on every call
+_METADATA_RGB = hex_to_rgb(METADATA_BG_COLOR_HEX)
+_MAIN_RGB = hex_to_rgb(MAIN_DECK_BG_COLOR_HEX)
+_METADATA_RGB_ARR = np.array(_METADATA_RGB, dtype=np.int32)
+_MAIN_RGB_ARR = np.array(_MAIN_RGB, dtype=np.int32)
+
+# "Closer to main than metadata" is a half-plane test: with N = main - metadata,
+# |P-main|^2 < |P-metadata|^2  <=>  2 P.N > |main|^2 - |metadata|^2
+# (kept in integers so it matches the two-distance comparison exactly)
+_NORMAL = _MAIN_RGB_ARR - _METADATA_RGB_ARR
+_HALF_PLANE_BIAS = int(_MAIN_RGB_ARR @ _MAIN_RGB_ARR - _METADATA_RGB_ARR @ _METADATA_RGB_ARR)
+_NORMAL_RGB = tuple(int(c) for c in _NORMAL)
+
+
+def color_distance_sq(c1, c2):
+    """Squared Euclidean distance between two RGB colors"""
+    # Unrolled for exactly 3 channels - no zip/generator per call
+    dr = int(c1[0]) - int(c2[0])
+    dg = int(c1[1]) - int(c2[1])
+    db = int(c1[2]) - int(c2[2])
+    return dr * dr + dg * dg + db * db
+
+
+if NUMBA_AVAILABLE:
+    # Eagerly compiled for the uint8 strip with int32 scalars - every intermediate
+    # stays in a machine register (255^2 * 3 fits in int32), no object traffic
+    _SCAN_SIGNATURE = numba.int32(
+        numba.uint8[:, :, :],
+        numba.int32, numba.int32, numba.int32,
+        numba.int32, numba.int32, numba.int32, numba.int32,
+        numba.int32, numba.int32, numba.int32,
+    )
+    
+    @numba.njit(_SCAN_SIGNATURE, cache=True, fastmath=True, boundscheck=False)
+    def _scan(cols, m_r, m_g, m_b, n_r, n_g, n_b, bias, thresh_sq, min_votes, required):
+        """
+        Native row-by-row scan down an (H, K, 3) strip of sampled columns
+        
+        A row counts as main_color when at least `min_votes` of its K pixels
+        are. Stops as soon as `required` consecutive main_color rows are seen,
+        so a boundary near the top only touches the rows above it.
+        
+        Returns:
+            Row of the first main_color row in the run, or -1 if none found
+        """
+        consecutive = 0
+        for y in range(cols.shape[0]):
+            votes = 0
+            for k in range(cols.shape[1]):
+                r = np.int32(cols[y, k, 0])
+                g = np.int32(cols[y, k, 1])
+                b = np.int32(cols[y, k, 2])
+                # Half-plane side first; the main distance only when it passes
+                if 2 * (r * n_r + g * n_g + b * n_b) <= bias:
+                    continue
+                if (r - m_r) ** 2 + (g - m_g) ** 2 + (b - m_b) ** 2 < thresh_sq:
+                    votes += 1
+            if votes >= min_votes:
+                consecutive += 1
+                if consecutive >= required:
+                    return y - required + 1
+            else:
+                consecutive = 0
+        return -1
+    
+    @numba.njit(parallel=True, cache=True)
+    def _scan_batch(cols_batch, lengths, m_r, m_g, m_b, n_r, n_g, n_b, bias, thresh_sq, min_votes, required):
+        """
+        Run _scan over N zero-padded (H, K, 3) strips in parallel
+        
+        Returns:
+            Array of N strip rows (-1 where no boundary was found)
+        """
+        out = np.empty(cols_batch.shape[0], dtype=np.int64)
+        for i in numba.prange(cols_batch.shape[0]):
+            out[i] = _scan(
+                cols_batch[i, :lengths[i]],
+                m_r, m_g, m_b, n_r, n_g, n_b, bias, thresh_sq, min_votes, required
+            )
+        return out
+
+
+def _classify_rows(cols):
+    """
+    Vectorized main_color test for an (N, K, 3) block of sampled pixels
+    
+    Returns:
+        Bool array of N rows: True where at least MIN_COLUMN_VOTES pixels are
+        closer to the main deck color than the metadata color, within threshold
+    """
+    cols = cols.astype(np.int32)
+    closer_to_main = 2 * (cols @ _NORMAL) > _HALF_PLANE_BIAS
+    diff_main = cols - _MAIN_RGB_ARR
+    dist_to_main = np.einsum('ijk,ijk->ij', diff_main, diff_main)
+    
+    is_main = closer_to_main & (dist_to_main < MAIN_COLOR_THRESHOLD_SQ)
+    return is_main.sum(axis=1) >= MIN_COLUMN_VOTES
+
+
+def _bisect_boundary(cols, probe_rows):
+    """
+    Bound the metadata -> main transition with a few probes and a bisection
+    
+    Classifies only O(log H) rows instead of the whole column. Rows may
+    change color more than once (e.g. a main_color band inside the header),
+    so this only gives an upper bound - callers still scan from row 0.
+    
+    Returns:
+        Row to fine-scan up to, or None if no probe hit main_color
+    """
+    probe_rows = [row for row in probe_rows if 0 <= row < len(cols)]
+    if not probe_rows:
+        return None
+    
+    hits = np.flatnonzero(_classify_rows(cols[probe_rows]))
+    if not hits.size:
+        return None
+    
+    # Last probe still in metadata / first probe in main deck
+    hi = probe_rows[hits[0]]
+    lo = probe_rows[hits[0] - 1] if hits[0] > 0 else 0
+    while hi - lo > BISECT_WINDOW_ROWS:
+        mid = (lo + hi) // 2
+        if _classify_rows(cols[mid:mid + 1])[0]:
+            hi = mid
+        else:
+            lo = mid
+    
+    return min(len(cols), hi + BISECT_WINDOW_ROWS)
+
+
+def _first_run(mask, required):
+    """
+    Find where the first run of `required` consecutive True values starts
+    
+    Window sums come from a cumulative sum, so there's no Python loop.
+    
+    Returns:
+        Index of the first True in the run, or -1 if none found
+    """
+    if mask.size < required:
+        return -1
+    cs = np.cumsum(mask, dtype=np.int32)
+    window = cs[required - 1:] - np.concatenate(([0], cs[:-required]))
+    hits = np.flatnonzero(window >= required)
+    return int(hits[0]) if hits.size else -1
+
+
+def _scan_pil(strip_img, col_offsets, required):
+    """
+    Pure-Python scan using PIL's pixel accessor - no NumPy array is built
+    
+    Same vote/run logic as the vectorized path, one pixel fetch at a time.
+    
+    Returns:
+        Row of the first main_color row in the run, or -1 if none found
+    """
+    px = strip_img.load()
+    n_r, n_g, n_b = _NORMAL_RGB
+    consecutive = 0
+    for y in range(strip_img.height):
+        votes = 0
+        for x in col_offsets:
+            pixel = px[x, y]
+            if 2 * (pixel[0] * n_r + pixel[1] * n_g + pixel[2] * n_b) <= _HALF_PLANE_BIAS:
+                continue
+            if color_distance_sq(pixel, _MAIN_RGB) < MAIN_COLOR_THRESHOLD_SQ:
+                votes += 1
+        if votes >= MIN_COLUMN_VOTES:
+            consecutive += 1
+            if consecutive >= required:
+                return y - required + 1
+        else:
+            consecutive = 0
+    return -1
 
 
-def detect_metadata_boundary(img_pil, skip_top_percent=10, sample_x_percent=5):
+def _sample_strip(img_pil, skip_top_percent, sample_x_percent):
+    """
+    Crop the narrow RGB strip around the sampled columns
+    
+    Only these columns are needed, so there's no need to copy the whole
+    H x W image into an array.
+    
+    Returns:
+        (strip_img, col_offsets, skip_rows)
+    """
+    width, height = img_pil.size
+    
+    skip_rows = int(height * (skip_top_percent / 100))
+    max_rows = int(height * (MAX_SCAN_PERCENT / 100)) + REQUIRED_CONSECUTIVE - 1
+    max_rows = min(height, max(skip_rows + 1, max_rows))
+    xs = [
+        min(max(int(width * ((sample_x_percent + offset) / 100)), 0), width - 1)
+        for offset in SAMPLE_X_OFFSETS_PERCENT
+    ]
+    
+    x_min = min(xs)
+    strip_img = img_pil.crop((x_min, skip_rows, max(xs) + 1, max_rows)).convert('RGB')
+    return strip_img, [x - x_min for x in xs], skip_rows
+
+
+def _find_run(strip_img, col_offsets, probe_rows, required, use_numpy=True):
+    """
+    Find the first run of `required` main_color rows in a cropped RGB strip
+    
+    Dispatches to the PIL, Numba or NumPy implementation.
+    
+    Args:
+        strip_img: RGB strip covering the sampled columns
+        col_offsets: Sampled column positions within the strip
+        probe_rows: Coarse bisection probes (strip rows), NumPy path only
+        required: Consecutive main_color rows needed to confirm
+        use_numpy: Set False to scan with PIL pixel access
+    
+    Returns:
+        Strip row where the run starts, or -1 if none found
+    """
+    if not use_numpy:
+        return _scan_pil(strip_img, col_offsets, required)
+    
+    cols = np.asarray(strip_img)[:, col_offsets, :]
+    
+    if NUMBA_AVAILABLE:
+        return _scan(
+            cols,
+            _MAIN_RGB[0], _MAIN_RGB[1], _MAIN_RGB[2],
+            _NORMAL_RGB[0], _NORMAL_RGB[1], _NORMAL_RGB[2], _HALF_PLANE_BIAS,
+            MAIN_COLOR_THRESHOLD_SQ, MIN_COLUMN_VOTES, required
+        )
+    
+    # Bound the boundary coarsely, then look for the first run above that bound
+    stop = _bisect_boundary(cols, probe_rows)
+    if stop:
+        run_start = _first_run(_classify_rows(cols[:stop]), required)
+        if run_start >= 0:
+            return run_start
+    
+    # Not confirmed above the bound - classify the whole column at once
+    return _first_run(_classify_rows(cols), required)
+
+
+def _coarse_strip(strip_img, col_offsets, height):
+    """
+    Strip to run the first scan on - box-downsampled for tall screenshots
+    
+    Returns:
+        (scan_img, scan_offsets, scale)
+    """
+    scale = DOWNSCALE_FACTOR if height > DOWNSCALE_MIN_HEIGHT else 1
+    if scale == 1:
+        return strip_img, col_offsets, 1
+    
+    small = strip_img.reduce(scale)
+    return small, [min(offset // scale, small.width - 1) for offset in col_offsets], scale
+
+
+def _refine_run(strip_img, col_offsets, run_scan, scale, required, use_numpy=True, precise=True):
+    """
+    Full-resolution strip row for a run found on the (downsampled) scan strip
+    
+    Returns:
+        Strip row where the run starts, or -1 if run_scan is -1
+    """
+    if run_scan < 0:
+        return -1
+    run_start = run_scan * scale
+    
+    if scale > 1 and precise:
+        # Recover the exact row from a full-resolution window around the hit
+        lo = max(0, (run_scan - 1) * scale)
+        hi = min(strip_img.height, (run_scan + 1) * scale + required)
+        fine = _find_run(
+            strip_img.crop((0, lo, strip_img.width, hi)),
+            col_offsets, [], required, use_numpy
+        )
+        if fine >= 0:
+            run_start = lo + fine
+    return run_start
+
+
+def detect_metadata_boundary(img_pil, skip_top_percent=10, sample_x_percent=5, use_numpy=True,
+                             precise=True):
     """
     Automatically detect metadata section boundary using color detection
     
     Args:
         img_pil: PIL Image object
         skip_top_percent: Skip top X% (to avoid status bar)
-        sample_x_percent: Sample at X% from left edge
+        sample_x_percent: Sample at X% from left edge (plus columns at +/-1% and +/-2%)
+        use_numpy: Set False to scan with PIL pixel access instead of NumPy/Numba
+        precise: On downscaled (tall) images, refine the hit at full resolution
     
     Returns:
         boundary_y: Y coordinate where metadata section ends
     """
-    img_array = np.array(img_pil)
-    height, width = img_array.shape[:2]
-    
-    metadata_rgb = hex_to_rgb(METADATA_BG_COLOR_HEX)
-    main_rgb = hex_to_rgb(MAIN_DECK_BG_COLOR_HEX)
+    height = img_pil.height
+    required_consecutive = REQUIRED_CONSECUTIVE
     
-    skip_rows = int(height * (skip_top_percent / 100))
-    sample_x = int(width * (sample_x_percent / 100))
+    strip_img, col_offsets, skip_rows = _sample_strip(img_pil, skip_top_percent, sample_x_percent)
+    probe_rows = [int(height * (p / 100)) - skip_rows for p in BISECT_PROBE_PERCENTS]
     
-    main_color_consecutive = 0
-    required_consecutive = 5  # Need 5 consecutive main_color pixels to confirm
+    scan_img, scan_offsets, scale = _coarse_strip(strip_img, col_offsets, height)
+    run_scan = _find_run(
+        scan_img, scan_offsets,
+        [row // scale for row in probe_rows],
+        required_consecutive,
+        use_numpy
+    )
+    run_start = _refine_run(strip_img, col_offsets, run_scan, scale, required_consecutive, use_numpy, precise)
     
-    # Scan down the left edge
-    for y in range(skip_rows, height):
-        pixel = img_array[y, sample_x][:3]  # Get RGB
-        dist_to_main = color_distance(pixel, main_rgb)
-        dist_to_metadata = color_distance(pixel, metadata_rgb)
-        
-        # Is this pixel closer to main deck color?
-        if dist_to_main < dist_to_metadata and dist_to_main < 30:  # Threshold
-            main_color_consecutive += 1
-            if main_color_consecutive >= required_consecutive:
-                # Found boundary! Back up to first main_color pixel
-                return y - required_consecutive + 1
-        else:
-            main_color_consecutive = 0
+    if run_start >= 0:
+        # Found boundary! First main_color row of the run
+        return skip_rows + run_start
     
     # Fallback to 20% if no clear boundary found
     return int(height * 0.20)
 
 
+def detect_metadata_boundaries(image_paths, skip_top_percent=10, sample_x_percent=5, max_workers=None):
+    """
+    Detect metadata boundaries for many images at once
+    
+    Images are decoded in a thread pool (PIL releases the GIL while decoding).
+    With numba, all (downsampled, for tall images) strips are then scanned in
+    one parallel kernel call and refined like detect_metadata_boundary does;
+    otherwise each image goes through detect_metadata_boundary in the pool.
+    
+    Args:
+        image_paths: List of image file paths
+        skip_top_percent: Skip top X% (to avoid status bar)
+        sample_x_percent: Sample at X% from left edge
+        max_workers: Thread count for loading (default: ThreadPoolExecutor's)
+    
+    Returns:
+        List of boundary_y values, in the same order as image_paths
+    """
+    if not NUMBA_AVAILABLE:
+        def detect_one(path):
+            with Image.open(path) as img:
+                return detect_metadata_boundary(img, skip_top_percent, sample_x_percent)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(detect_one, image_paths))
+    
+    def load_strip(path):
+        with Image.open(path) as img:
+            strip_img, col_offsets, skip_rows = _sample_strip(img, skip_top_percent, sample_x_percent)
+            scan_img, scan_offsets, scale = _coarse_strip(strip_img, col_offsets, img.height)
+            cols = np.asarray(scan_img)[:, scan_offsets, :]
+            return cols, (strip_img, col_offsets, scale, skip_rows, img.height)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        loaded = list(executor.map(load_strip, image_paths))
+    if not loaded:
+        return []
+    
+    # Zero-pad to one (N, H, K, 3) array - black never matches the main deck color
+    lengths = np.array([cols.shape[0] for cols, _ in loaded], dtype=np.int64)
+    cols_batch = np.zeros((len(loaded), int(lengths.max()), len(SAMPLE_X_OFFSETS_PERCENT), 3), dtype=np.uint8)
+    for i, (cols, _) in enumerate(loaded):
+        cols_batch[i, :cols.shape[0]] = cols
+    
+    run_starts = _scan_batch(
+        cols_batch, lengths,
+        _MAIN_RGB[0], _MAIN_RGB[1], _MAIN_RGB[2],
+        _NORMAL_RGB[0], _NORMAL_RGB[1], _NORMAL_RGB[2], _HALF_PLANE_BIAS,
+        MAIN_COLOR_THRESHOLD_SQ, MIN_COLUMN_VOTES, REQUIRED_CONSECUTIVE
+    )
+    
+    boundaries = []
+    for run_scan, (_, (strip_img, col_offsets, scale, skip_rows, height)) in zip(run_starts, loaded):
+        run_start = _refine_run(strip_img, col_offsets, int(run_scan), scale, REQUIRED_CONSECUTIVE)
+        boundaries.append(skip_rows + run_start if run_start >= 0 else int(height * 0.20))
+    return boundaries
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
         description='Detect metadata section boundary using color detection'
     )
-    parser.add_argument('image', help='Path to decklist image')
+    parser.add_argument('image', help='Path to decklist image (or a folder of images for batch mode)')
     parser.add_argument('--crop', action='store_true', help='Crop and save metadata section')
     parser.add_argument('--output', default='metadata_section_auto_crop.png', help='Output filename')
     parser.add_argument('--skip-top', type=int, default=10, help='Skip top X percent (default: 10)')
     parser.add_argument('--sample-x', type=int, default=5, help='Sample at X percent from left (default: 5)')
+    parser.add_argument('--no-numpy', action='store_true', help='Scan with PIL pixel access instead of NumPy')
     
     args = parser.parse_args()
     
+    if os.path.isdir(args.image):
+        paths = sorted(
+            os.path.join(args.image, name) for name in os.listdir(args.image)
+            if name.lower().endswith(('.jpg', '.jpeg', '.png'))
+        )
+        print(f"Batch mode: {len(paths)} images in {args.image}")
+        boundaries = detect_metadata_boundaries(
+            paths,
+            skip_top_percent=args.skip_top,
+            sample_x_percent=args.sample_x
+        )
+        for path, boundary_y in zip(paths, boundaries):
+            print(f"  Y={boundary_y}px  {os.path.basename(path)}")
+        sys.exit(0)
+    
     try:
         img = Image.open(args.image)
         print(f"Image size: {img.width}x{img.height}px")
@@ -87,7 +468,8 @@ if __name__ == '__main__':
         boundary_y = detect_metadata_boundary(
             img, 
             skip_top_percent=args.skip_top, 
-            sample_x_percent=args.sample_x
+            sample_x_percent=args.sample_x,
+            use_numpy=not args.no_numpy
         )
         
         metadata_percent = (boundary_y / img.height) * 100
@@ -2,21 +2,31 @@
 """
 Test Runner
 Runs all tests with proper configuration
+
+Usage:
+    python run_tests.py [pytest args...]
+    python run_tests.py --subprocess [pytest args...]   # Fresh interpreter
 """
 
 import sys
 import subprocess
 
+import pytest
+
 
-def run_tests(args=None):
+def run_tests(args=None, use_subprocess=False):
     """
     Run pytest with common options
     
+    Runs in-process via pytest.main by default, which skips the interpreter
+    start-up and plugin discovery of a forked process.
+    
     Args:
         args: Additional pytest arguments
+        use_subprocess: Run pytest in a fresh interpreter instead
+                        (e.g. after rebuilding an editable install)
     """
-    cmd = [
-        sys.executable, "-m", "pytest",
+    argv = [
         "tests/",
         "-v",  # Verbose
         "--tb=short",  # Shorter traceback
@@ -24,24 +34,24 @@ def run_tests(args=None):
     ]
     
     if args:
-        cmd.extend(args)
+        argv.extend(args)
     
     print("=" * 60)
     print("Running RiftboundOCR Test Suite")
     print("=" * 60)
     print()
     
-    result = subprocess.run(cmd)
+    if use_subprocess:
+        result = subprocess.run([sys.executable, "-m", "pytest", *argv])
+        return result.returncode
     
-    return result.returncode
+    return int(pytest.main(argv))
 
 
 if __name__ == "__main__":
     # Pass any command line args to pytest
     additional_args = sys.argv[1:]
-    sys.exit(run_tests(additional_args))
-
-
-
-
-
+    use_subprocess = "--subprocess" in additional_args
+    if use_subprocess:
+        additional_args.remove("--subprocess")
+    sys.exit(run_tests(additional_args, use_subprocess=use_subprocess))
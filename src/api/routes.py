@@ -4,17 +4,33 @@ Handles image upload, processing, and decklist extraction
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse, StreamingResponse
-from typing import List, Tuple
-import tempfile
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from typing import List, Tuple, Union
+from pydantic import BaseModel
 import os
-import uuid
+import copy
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import secrets
 import logging
 import json
 import time
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
 
+# Try to import orjson for faster SSE serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# JSON responses are rendered with orjson when it is installed
+APIJSONResponse = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
 # Import DIRECT functions from working implementation (not classes!)
 from src.ocr.parser import parse_with_two_stage
 from src.ocr.matcher import CardMatcher
@@ -32,10 +48,40 @@ from src.models.schemas import (
 from src.config import settings
 from src.clients.riftbound_api import RiftboundAPIClient
 
+# Try to import the compiled decklist validator (generated by compile_schemas.py)
+try:
+    from src.models._compiled_validators import validate as validate_decklist_payload
+    DECKLIST_VALIDATOR_AVAILABLE = True
+except ImportError:
+    DECKLIST_VALIDATOR_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Decklist sections, in response order
+SECTIONS = ('legend', 'main_deck', 'battlefields', 'runes', 'side_deck')
+
+# Decklists skip Pydantic validation - in debug mode check their payload shape
+CHECK_DECKLIST_PAYLOADS = settings.debug and DECKLIST_VALIDATOR_AVAILABLE
+
+
+def build_decklist(matched: dict) -> DecklistResponse:
+    """
+    DecklistResponse for matcher output, built without validation
+    
+    In debug mode the serialized payload is checked by the compiled
+    DecklistResponse schema validator (when it has been generated).
+    """
+    decklist = DecklistResponse.build_trusted(matched)
+    if CHECK_DECKLIST_PAYLOADS:
+        try:
+            validate_decklist_payload(decklist.model_dump(mode='json'))
+        except ValueError as e:
+            # Our own output is wrong - not the client's fault, so not a 400
+            raise RuntimeError(f"Decklist payload doesn't match its schema: {e}") from e
+    return decklist
+
 # Initialize main API client (optional - only if configured)
 main_api_client = None
 if settings.main_api_url and settings.main_api_url != "http://localhost:8000/api":
@@ -48,6 +94,18 @@ if settings.main_api_url and settings.main_api_url != "http://localhost:8000/api
     except Exception as e:
         logger.warning(f"Failed to initialize main API client: {e}")
 
+
+async def warm_up_main_api_client():
+    """Pre-open the main API client's connection (if configured)"""
+    if main_api_client is not None:
+        await main_api_client.warm_up()
+
+
+async def close_main_api_client():
+    """Close the main API client's connections (if configured)"""
+    if main_api_client is not None:
+        await main_api_client.aclose()
+
 # Initialize matcher (singleton pattern)
 print("\n" + "=" * 60)
 print("⚙️  INITIALIZING OCR SERVICE COMPONENTS")
@@ -56,7 +114,7 @@ print(f"[1/3] Loading card matcher from: {settings.card_mapping_path}")
 print(f"      File exists: {os.path.exists(settings.card_mapping_path)}")
 
 try:
-    matcher = CardMatcher(settings.card_mapping_path)
+    matcher = CardMatcher(settings.card_mapping_path, cache_dir=settings.matcher_cache_dir)
     print(f"✓ Card matcher loaded: {len(matcher.mappings)} cards indexed")
     logger.info(f"Card matcher initialized: {len(matcher.mappings)} cards")
 except Exception as e:
@@ -101,6 +159,266 @@ else:
 print("=" * 60 + "\n")
 logger.info("OCR service components initialization complete")
 
+# Decklist IDs: 128 random bits as hex, straight from the CSPRNG
+_new_decklist_id = secrets.token_hex
+
+
+# Latest sampled process RSS in MB, refreshed in the background by rss_sampler()
+_RSS = {"mb": 0.0}
+
+
+async def rss_sampler(interval: float = 2.0):
+    """Sample process RSS into _RSS so request handlers never poll psutil themselves"""
+    try:
+        import psutil
+    except ImportError:
+        return
+    
+    process = psutil.Process()
+    while True:
+        _RSS["mb"] = process.memory_info().rss / 1024 / 1024
+        await asyncio.sleep(interval)
+
+
+# Metadata fields match_decklist reads from a parsed decklist
+_MATCH_METADATA_FIELDS = ('player', 'legend_name', 'event', 'date', 'placement')
+
+
+@functools.lru_cache(maxsize=1024)
+def _match_cached(key: tuple) -> dict:
+    """Run the matcher on a canonicalized decklist key (see match_decklist_cached)"""
+    metadata, sections = key
+    parsed = dict(zip(_MATCH_METADATA_FIELDS, metadata))
+    parsed['cards'] = {
+        section: [
+            {'name_cn': name_cn, 'quantity': quantity, 'confidence': confidence}
+            for name_cn, quantity, confidence in cards
+        ]
+        for section, cards in sections
+    }
+    return matcher.match_decklist(parsed)
+
+
+def match_decklist_cached(parsed: dict) -> dict:
+    """
+    matcher.match_decklist, memoized on everything it reads from `parsed`
+    
+    Re-submitted or near-identical decklists skip matching entirely. Returns
+    a deep copy so callers can add fields (decklist_id) without touching the
+    cached result.
+    """
+    key = (
+        tuple(parsed.get(field) for field in _MATCH_METADATA_FIELDS),
+        tuple(
+            (section, tuple((c['name_cn'], c['quantity'], c['confidence']) for c in cards))
+            for section, cards in parsed['cards'].items()
+        )
+    )
+    return copy.deepcopy(_match_cached(key))
+
+
+async def match_decklist_async(parsed: dict) -> dict:
+    """
+    match_decklist_cached on a worker thread, keeping the event loop free
+    
+    Runs on asyncio's default executor rather than _BATCH_EXECUTOR so matching
+    never queues behind long-running OCR jobs.
+    """
+    return await asyncio.to_thread(match_decklist_cached, parsed)
+
+
+# Shared worker pool for /process-batch-fast - created once and reused across
+# requests instead of spinning up new threads per batch. Threads (not processes)
+# so every worker shares the already-loaded OCR models and matcher.
+_BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=settings.max_workers, thread_name_prefix="ocr")
+
+
+def shutdown_batch_executor():
+    """Wait for in-flight batch work and release the shared worker pool"""
+    _BATCH_EXECUTOR.shutdown(wait=True)
+
+
+# OCR retry policy - transient Paddle/Easy stalls (timeouts, OOM) are retried
+# with exponential backoff; anything else fails immediately. RuntimeError is
+# not retried: model init failures are wrapped in it (a retry would reload the
+# model just to fail again) and torch shape errors never succeed on retry.
+OCR_MAX_ATTEMPTS = 3
+_RETRYABLE_OCR_ERRORS = (TimeoutError, MemoryError)
+
+# Caps in-flight OCR across all async endpoints
+_OCR_SEMAPHORE = asyncio.Semaphore(settings.max_workers)
+
+
+def _ocr_backoff(attempt: int) -> float:
+    """Delay before retry number `attempt + 1` (0.5s, 1s, 2s, ... capped at 8s)"""
+    return min(8, 0.5 * 2 ** attempt)
+
+
+# Parsed results of recently seen uploads, keyed by content hash (LRU).
+# Shared by the event loop and executor workers, hence the lock.
+_OCR_CACHE_MAX = 256
+_OCR_CACHE = OrderedDict()
+_OCR_CACHE_LOCK = threading.Lock()
+_OCR_CACHE_STATS = {'hits': 0, 'misses': 0}
+
+
+def _content_hash(content: bytes) -> bytes:
+    """
+    OCR cache key for an upload body
+    
+    The cache is shared by every client, so the key must be collision
+    resistant - otherwise a crafted upload could be served another's result.
+    """
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+def _ocr_cache_get(key):
+    """Cached parse for `key` (a private copy), or None"""
+    with _OCR_CACHE_LOCK:
+        parsed = _OCR_CACHE.get(key)
+        if parsed is None:
+            _OCR_CACHE_STATS['misses'] += 1
+            return None
+        _OCR_CACHE.move_to_end(key)
+        _OCR_CACHE_STATS['hits'] += 1
+    return copy.deepcopy(parsed)
+
+
+def _ocr_cache_put(key, parsed: dict):
+    parsed = copy.deepcopy(parsed)
+    with _OCR_CACHE_LOCK:
+        _OCR_CACHE[key] = parsed
+        _OCR_CACHE.move_to_end(key)
+        if len(_OCR_CACHE) > _OCR_CACHE_MAX:
+            _OCR_CACHE.popitem(last=False)
+
+
+def cache_stats() -> dict:
+    """Sizes and hit/miss counters of the OCR, match and card lookup caches"""
+    match_info = _match_cached.cache_info()
+    return {
+        "ocr": {
+            **_OCR_CACHE_STATS,
+            "size": len(_OCR_CACHE),
+            "maxsize": _OCR_CACHE_MAX
+        },
+        "match": {
+            "hits": match_info.hits,
+            "misses": match_info.misses,
+            "size": match_info.currsize,
+            "maxsize": match_info.maxsize
+        },
+        "card_lookup": main_api_client.card_cache.stats() if main_api_client else None
+    }
+
+
+def parse_with_retry(content: bytes) -> dict:
+    """
+    Run parse_with_two_stage with retries (blocking - for executor workers)
+    
+    The one place uploads are OCRed: re-uploads of identical image bytes are
+    answered from the OCR cache, everything else is parsed and cached.
+    """
+    key = _content_hash(content)
+    parsed = _ocr_cache_get(key)
+    if parsed is not None:
+        return parsed
+    
+    for attempt in range(OCR_MAX_ATTEMPTS):
+        try:
+            parsed = parse_with_two_stage(content)
+            _ocr_cache_put(key, parsed)
+            return parsed
+        except _RETRYABLE_OCR_ERRORS as e:
+            if attempt == OCR_MAX_ATTEMPTS - 1:
+                raise
+            delay = _ocr_backoff(attempt)
+            logger.warning(f"OCR attempt {attempt + 1} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+async def run_ocr(content: bytes) -> dict:
+    """
+    Run parse_with_retry on the shared pool under a global concurrency cap,
+    without blocking the event loop
+    """
+    async with _OCR_SEMAPHORE:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_BATCH_EXECUTOR, parse_with_retry, content)
+
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Upload exceeds settings.max_file_size_mb"""
+    
+    def __init__(self, size_mb: float):
+        super().__init__(f"File size ({size_mb:.1f}MB) exceeds maximum ({settings.max_file_size_mb}MB)")
+        self.size_mb = size_mb
+
+
+def is_image_upload(file: UploadFile) -> bool:
+    """Check the declared content type (no body read needed)"""
+    return bool(file.content_type and file.content_type.startswith('image/'))
+
+
+async def read_upload(file: UploadFile, max_bytes: int = None) -> bytes:
+    """
+    Read an upload body, rejecting oversized files before buffering them
+    
+    When the size is known (Starlette counts it while spooling the body) the
+    body is read in one call - a single allocation, no chunk list to join.
+    Otherwise it reads in chunks and stops as soon as the running total
+    passes the limit.
+    
+    Args:
+        file: Upload to read
+        max_bytes: Size limit (default: settings.max_file_size_mb)
+    
+    Raises:
+        UploadTooLargeError: File exceeds the limit
+    """
+    if max_bytes is None:
+        max_bytes = settings.max_file_size_mb * 1024 * 1024
+    if file.size is not None:
+        if file.size > max_bytes:
+            raise UploadTooLargeError(file.size / (1024 * 1024))
+        return await file.read()
+    
+    chunks = []
+    total = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise UploadTooLargeError(total / (1024 * 1024))
+        chunks.append(chunk)
+    
+    return b''.join(chunks)
+
+
+async def read_uploads(files: List[UploadFile]) -> list:
+    """
+    Read all upload bodies concurrently instead of one after another
+    
+    Reads are bounded by a semaphore. Non-image files are not read at all
+    (None). A failed or oversized read is returned in place as its exception
+    so callers can report it against that file only.
+    """
+    semaphore = asyncio.Semaphore(settings.max_workers * 2)
+    max_bytes = settings.max_file_size_mb * 1024 * 1024
+    
+    async def read_one(file: UploadFile):
+        if not is_image_upload(file):
+            return None
+        async with semaphore:
+            return await read_upload(file, max_bytes)
+    
+    return await asyncio.gather(*(read_one(f) for f in files), return_exceptions=True)
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -113,7 +431,7 @@ async def health_check():
         if matcher is None:
             # Service is running but matcher failed to load
             # Return 200 (not 503) so Railway doesn't restart
-            return JSONResponse(
+            return APIJSONResponse(
                 status_code=200,
                 content={
                     "status": "degraded",
@@ -139,7 +457,7 @@ async def health_check():
     except Exception as e:
         logger.error(f"Health check error: {e}", exc_info=True)
         # Still return 200 to avoid restart loops
-        return JSONResponse(
+        return APIJSONResponse(
             status_code=200,
             content={
                 "status": "error",
@@ -168,10 +486,22 @@ async def get_service_stats():
             "supported_formats": ["JPG", "PNG"],
             "max_file_size_mb": settings.max_file_size_mb,
             "use_gpu": settings.use_gpu
-        }
+        },
+        cache=cache_stats()
     )
 
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Get cache statistics
+    
+    Returns sizes and hit/miss counters for the in-process caches, for tuning
+    their limits
+    """
+    return cache_stats()
+
+
 @router.post("/process", response_model=DecklistResponse)
 async def process_single_image(file: UploadFile = File(...)):
     """
@@ -188,58 +518,56 @@ async def process_single_image(file: UploadFile = File(...)):
         )
     
     # Validate file type
-    if not file.content_type or not file.content_type.startswith('image/'):
+    if not is_image_upload(file):
         raise HTTPException(
             status_code=400,
             detail="File must be an image (JPG/PNG)"
         )
     
-    # Check file size
-    content = await file.read()
-    file_size_mb = len(content) / (1024 * 1024)
-    if file_size_mb > settings.max_file_size_mb:
+    # Check file size (before buffering the whole body)
+    try:
+        content = await read_upload(file)
+    except UploadTooLargeError as e:
         raise HTTPException(
             status_code=400,
-            detail=f"File size ({file_size_mb:.1f}MB) exceeds maximum ({settings.max_file_size_mb}MB)"
+            detail=str(e)
         )
     
-    # Save to temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
-    
     try:
-        # Memory monitoring
-        import psutil
-        import asyncio
-        process = psutil.Process()
-        mem_before = process.memory_info().rss / 1024 / 1024  # MB
-        print(f"[MEMORY] Before OCR: {mem_before:.1f}MB")
+        # Memory monitoring (sampled in the background - see rss_sampler)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        mem_before = _RSS["mb"]
+        if debug:
+            logger.debug(f"[MEMORY] Before OCR: {mem_before:.1f}MB")
         logger.info(f"Processing image: {file.filename} (Memory: {mem_before:.1f}MB)")
         
         # Stage 1: Parse image (using direct function from working implementation)
-        print(f"[OCR] Starting parse_with_two_stage for {file.filename}")
+        if debug:
+            logger.debug(f"[OCR] Starting parse_with_two_stage for {file.filename}")
         
         # Run OCR in thread pool to prevent blocking and allow timeout handling
-        loop = asyncio.get_event_loop()
-        parsed = await loop.run_in_executor(None, parse_with_two_stage, tmp_path)
+        parsed = await run_ocr(content)
         
-        mem_after_parse = process.memory_info().rss / 1024 / 1024
-        print(f"[MEMORY] After parsing: {mem_after_parse:.1f}MB (delta: +{mem_after_parse - mem_before:.1f}MB)")
-        logger.info(f"Parsing complete. Extracted {sum(len(parsed.get(s, [])) for s in ['legend', 'main_deck', 'battlefields', 'runes', 'side_deck'])} card entries")
+        if debug:
+            mem_after_parse = _RSS["mb"]
+            logger.debug(f"[MEMORY] After parsing: {mem_after_parse:.1f}MB (delta: +{mem_after_parse - mem_before:.1f}MB)")
+        parsed_cards = parsed.get('cards', {})
+        logger.info(f"Parsing complete. Extracted {sum(len(parsed_cards.get(s, ())) for s in SECTIONS)} card entries")
         
         # Stage 2: Match cards to English
-        print(f"[MATCHING] Starting card matching")
-        matched = matcher.match_decklist(parsed)
+        if debug:
+            logger.debug("[MATCHING] Starting card matching")
+        matched = await match_decklist_async(parsed)
         
-        mem_final = process.memory_info().rss / 1024 / 1024
-        print(f"[MEMORY] After matching: {mem_final:.1f}MB (total delta: +{mem_final - mem_before:.1f}MB)")
+        if debug:
+            mem_final = _RSS["mb"]
+            logger.debug(f"[MEMORY] After matching: {mem_final:.1f}MB (total delta: +{mem_final - mem_before:.1f}MB)")
         logger.info(f"Matching complete. Accuracy: {matched.get('stats', {}).get('accuracy', 0):.2f}%")
         
         # Add unique ID
-        matched['decklist_id'] = str(uuid.uuid4())
+        matched['decklist_id'] = _new_decklist_id(16)
         
-        return DecklistResponse(**matched)
+        return build_decklist(matched)
     
     except ValueError as e:
         logger.error(f"Validation error: {e}")
@@ -253,12 +581,6 @@ async def process_single_image(file: UploadFile = File(...)):
             status_code=500,
             detail=f"Processing failed: {str(e)}"
         )
-    finally:
-        # Clean up temp file
-        try:
-            os.unlink(tmp_path)
-        except Exception as e:
-            logger.warning(f"Failed to delete temp file: {e}")
 
 
 @router.post("/process-stream")
@@ -274,22 +596,16 @@ async def process_single_image_stream(file: UploadFile = File(...)):
         raise HTTPException(status_code=503, detail="Card matcher not initialized")
     
     # Validate file
-    if not file.content_type or not file.content_type.startswith('image/'):
+    if not is_image_upload(file):
         raise HTTPException(status_code=400, detail="File must be an image (JPG/PNG)")
     
-    content = await file.read()
-    file_size_mb = len(content) / (1024 * 1024)
-    if file_size_mb > settings.max_file_size_mb:
+    try:
+        content = await read_upload(file)
+    except UploadTooLargeError:
         raise HTTPException(status_code=400, detail=f"File size exceeds {settings.max_file_size_mb}MB")
     
     async def event_generator():
-        tmp_path = None
         try:
-            # Save temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp:
-                tmp.write(content)
-                tmp_path = tmp.name
-            
             # Send progress: starting
             yield format_sse_event("progress", {
                 "status": "starting",
@@ -304,9 +620,7 @@ async def process_single_image_stream(file: UploadFile = File(...)):
                 "progress": 20
             })
             
-            import asyncio
-            loop = asyncio.get_event_loop()
-            parsed = await loop.run_in_executor(None, parse_with_two_stage, tmp_path)
+            parsed = await run_ocr(content)
             
             # Send progress: matching
             yield format_sse_event("progress", {
@@ -316,8 +630,8 @@ async def process_single_image_stream(file: UploadFile = File(...)):
             })
             
             # Stage 2: Match
-            matched = matcher.match_decklist(parsed)
-            matched['decklist_id'] = str(uuid.uuid4())
+            matched = await match_decklist_async(parsed)
+            matched['decklist_id'] = _new_decklist_id(16)
             
             # Send final result
             yield format_sse_event("result", matched)
@@ -329,12 +643,6 @@ async def process_single_image_stream(file: UploadFile = File(...)):
                 "error": str(e),
                 "message": f"Processing failed: {str(e)}"
             })
-        finally:
-            if tmp_path:
-                try:
-                    os.unlink(tmp_path)
-                except Exception as e:
-                    logger.warning(f"Failed to delete temp file: {e}")
     
     return StreamingResponse(
         event_generator(),
@@ -377,53 +685,43 @@ async def process_batch(files: List[UploadFile] = File(...)):
     
     logger.info(f"Processing batch of {len(files)} images")
     
+    contents = await read_uploads(files)
+    
     for idx, file in enumerate(files):
         try:
             # Validate file type
-            if not file.content_type or not file.content_type.startswith('image/'):
+            if not is_image_upload(file):
                 logger.warning(f"Skipping non-image file: {file.filename}")
                 failed_count += 1
                 continue
             
-            # Read file content
-            content = await file.read()
+            # File content (read concurrently above)
+            content = contents[idx]
             
-            # Check file size
-            file_size_mb = len(content) / (1024 * 1024)
-            if file_size_mb > settings.max_file_size_mb:
-                logger.warning(f"Skipping oversized file: {file.filename} ({file_size_mb:.1f}MB)")
+            # Check file size (oversized uploads were rejected without being buffered)
+            if isinstance(content, UploadTooLargeError):
+                logger.warning(f"Skipping oversized file: {file.filename} ({content.size_mb:.1f}MB)")
                 failed_count += 1
                 continue
+            if isinstance(content, Exception):
+                raise content
             
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp:
-                tmp.write(content)
-                tmp_path = tmp.name
+            logger.info(f"[{idx+1}/{len(files)}] Processing: {file.filename}")
             
-            try:
-                logger.info(f"[{idx+1}/{len(files)}] Processing: {file.filename}")
-                
-                # Process image (using direct function from working implementation)
-                parsed = parse_with_two_stage(tmp_path)
-                matched = matcher.match_decklist(parsed)
-                matched['decklist_id'] = str(uuid.uuid4())
-                
-                # Add to results
-                results.append(DecklistResponse(**matched))
-                successful_count += 1
-                
-                # Track accuracy
-                if matched.get('stats'):
-                    total_accuracy += matched['stats']['accuracy']
-                
-                logger.info(f"[{idx+1}/{len(files)}] Success - Accuracy: {matched.get('stats', {}).get('accuracy', 0):.2f}%")
+            # Process image (using direct function from working implementation)
+            parsed = await run_ocr(content)
+            matched = await match_decklist_async(parsed)
+            matched['decklist_id'] = _new_decklist_id(16)
+            
+            # Add to results
+            results.append(build_decklist(matched))
+            successful_count += 1
+            
+            # Track accuracy
+            if matched.get('stats'):
+                total_accuracy += matched['stats']['accuracy']
             
-            finally:
-                # Clean up temp file
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
+            logger.info(f"[{idx+1}/{len(files)}] Success - Accuracy: {matched.get('stats', {}).get('accuracy', 0):.2f}%")
         
         except Exception as e:
             logger.error(f"[{idx+1}/{len(files)}] Failed to process {file.filename}: {e}")
@@ -444,7 +742,7 @@ async def process_batch(files: List[UploadFile] = File(...)):
     )
 
 
-def format_sse_event(event: str, data: dict) -> str:
+def format_sse_event(event: str, data: Union[BaseModel, dict, str, bytes]) -> bytes:
     """
     Format data as Server-Sent Event (SSE)
     
@@ -453,8 +751,23 @@ def format_sse_event(event: str, data: dict) -> str:
     data: <json_data>
     
     (blank line to separate events)
+    
+    `data` is an SSE event model (serialized straight to JSON by
+    pydantic-core, no intermediate dict), a dict, or pre-encoded JSON.
+    Returns bytes (orjson for dicts when available) so StreamingResponse
+    sends them as-is.
     """
-    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    if isinstance(data, BaseModel):
+        payload = data.model_dump_json().encode()
+    elif isinstance(data, str):
+        payload = data.encode()
+    elif isinstance(data, bytes):
+        payload = data
+    elif ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, default=str)
+    else:
+        payload = json.dumps(data, default=str).encode()
+    return b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
 
 
 def process_single_image_sync(file_data: Tuple[bytes, str, int]) -> dict:
@@ -465,31 +778,29 @@ def process_single_image_sync(file_data: Tuple[bytes, str, int]) -> dict:
         file_data: Tuple of (file_content, filename, index)
         
     Returns:
-        Dict with success status and result/error
+        Dict with success status and result/error. On success the decklist is
+        built here without validation (see build_decklist) and returned
+        pre-serialized as 'decklist_json'.
     """
     content, filename, index = file_data
     
-    # Save to temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
-    
     try:
         logger.info(f"[Worker] Processing: {filename} (index {index})")
         
-        # Process with OCR
-        parsed = parse_with_two_stage(tmp_path)
-        matched = matcher.match_decklist(parsed)
-        matched['decklist_id'] = str(uuid.uuid4())
+        # Process with OCR (straight from the in-memory upload)
+        parsed = parse_with_retry(content)
+        matched = match_decklist_cached(parsed)
+        matched['decklist_id'] = _new_decklist_id(16)
         
         # Create decklist response
-        decklist = DecklistResponse(**matched)
+        decklist = build_decklist(matched)
         
         return {
             'success': True,
             'index': index,
             'filename': filename,
-            'decklist': decklist.model_dump()
+            'decklist_json': decklist.model_dump_json(),
+            'accuracy': decklist.stats.accuracy if decklist.stats else None
         }
     
     except Exception as e:
@@ -501,13 +812,6 @@ def process_single_image_sync(file_data: Tuple[bytes, str, int]) -> dict:
             'error': str(e),
             'error_type': 'processing'
         }
-    
-    finally:
-        # Clean up temp file
-        try:
-            os.unlink(tmp_path)
-        except Exception as e:
-            logger.warning(f"[Worker] Failed to delete temp file: {e}")
 
 
 @router.post("/process-batch-stream")
@@ -541,6 +845,14 @@ async def process_batch_stream(files: List[UploadFile] = File(...)):
     
     async def event_generator():
         """Generate SSE events as images are processed"""
+        # Bind hot-loop globals to locals once per stream. Events are built
+        # with model_construct: every field comes from our own code, so the
+        # schema constraints (kept for the API docs) aren't re-checked.
+        progress_event = SSEProgressEvent.model_construct
+        error_event = SSEErrorEvent.model_construct
+        result_event = SSEResultEvent.model_construct
+        sse = format_sse_event
+        
         total = len(files)
         successful = 0
         failed = 0
@@ -549,106 +861,96 @@ async def process_batch_stream(files: List[UploadFile] = File(...)):
         
         logger.info(f"Starting SSE batch stream for {total} images")
         
+        contents = await read_uploads(files)
+        
         for idx, file in enumerate(files):
             filename = file.filename or f"image_{idx}.jpg"
             
             try:
                 # Send progress event - validating
-                progress_data = SSEProgressEvent(
+                progress_data = progress_event(
                     current=idx + 1,
                     total=total,
                     filename=filename,
                     status="validating"
-                ).model_dump()
-                yield format_sse_event("progress", progress_data)
+                )
+                yield sse("progress", progress_data)
                 
                 # Validate file type
-                if not file.content_type or not file.content_type.startswith('image/'):
-                    error_data = SSEErrorEvent(
+                if not is_image_upload(file):
+                    error_data = error_event(
                         index=idx,
                         filename=filename,
                         error="File must be an image (JPG/PNG)",
                         error_type="validation"
-                    ).model_dump()
-                    yield format_sse_event("error", error_data)
+                    )
+                    yield sse("error", error_data)
                     logger.warning(f"[{idx+1}/{total}] Skipping non-image file: {filename}")
                     failed += 1
                     continue
                 
-                # Read file content
-                content = await file.read()
+                # File content (read concurrently above)
+                content = contents[idx]
                 
-                # Check file size
-                file_size_mb = len(content) / (1024 * 1024)
-                if file_size_mb > settings.max_file_size_mb:
-                    error_data = SSEErrorEvent(
+                # Check file size (oversized uploads were rejected without being buffered)
+                if isinstance(content, UploadTooLargeError):
+                    error_data = error_event(
                         index=idx,
                         filename=filename,
-                        error=f"File size ({file_size_mb:.1f}MB) exceeds maximum ({settings.max_file_size_mb}MB)",
+                        error=str(content),
                         error_type="validation"
-                    ).model_dump()
-                    yield format_sse_event("error", error_data)
+                    )
+                    yield sse("error", error_data)
                     logger.warning(f"[{idx+1}/{total}] Skipping oversized file: {filename}")
                     failed += 1
                     continue
+                if isinstance(content, Exception):
+                    raise content
                 
                 # Send progress event - processing
-                progress_data = SSEProgressEvent(
+                progress_data = progress_event(
                     current=idx + 1,
                     total=total,
                     filename=filename,
                     status="processing"
-                ).model_dump()
-                yield format_sse_event("progress", progress_data)
+                )
+                yield sse("progress", progress_data)
                 
-                # Save to temp file
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp:
-                    tmp.write(content)
-                    tmp_path = tmp.name
+                logger.info(f"[{idx+1}/{total}] Processing: {filename}")
                 
-                try:
-                    logger.info(f"[{idx+1}/{total}] Processing: {filename}")
-                    
-                    # Process image with OCR
-                    parsed = parse_with_two_stage(tmp_path)
-                    matched = matcher.match_decklist(parsed)
-                    matched['decklist_id'] = str(uuid.uuid4())
-                    
-                    # Create decklist response
-                    decklist = DecklistResponse(**matched)
-                    
-                    # Send result event
-                    result_data = SSEResultEvent(
-                        index=idx,
-                        filename=filename,
-                        decklist=decklist
-                    ).model_dump()
-                    yield format_sse_event("result", result_data)
-                    
-                    successful += 1
-                    
-                    # Track accuracy
-                    if matched.get('stats'):
-                        accuracy = matched['stats']['accuracy']
-                        total_accuracy += accuracy
-                        logger.info(f"[{idx+1}/{total}] Success - Accuracy: {accuracy:.2f}%")
-                    
-                finally:
-                    # Clean up temp file
-                    try:
-                        os.unlink(tmp_path)
-                    except Exception as e:
-                        logger.warning(f"Failed to delete temp file: {e}")
+                # Process image with OCR
+                parsed = await run_ocr(content)
+                matched = await match_decklist_async(parsed)
+                matched['decklist_id'] = _new_decklist_id(16)
+                
+                # Create decklist response
+                decklist = build_decklist(matched)
+                
+                # Send result event
+                result_data = result_event(
+                    index=idx,
+                    filename=filename,
+                    decklist=decklist
+                )
+                yield sse("result", result_data)
+                
+                successful += 1
+                
+                # Track accuracy
+                if matched.get('stats'):
+                    accuracy = matched['stats']['accuracy']
+                    total_accuracy += accuracy
+                    logger.info(f"[{idx+1}/{total}] Success - Accuracy: {accuracy:.2f}%")
             
             except Exception as e:
                 # Send error event (don't break the stream)
-                error_data = SSEErrorEvent(
+                error_data = error_event(
                     index=idx,
                     filename=filename,
                     error=str(e),
                     error_type="processing"
-                ).model_dump()
-                yield format_sse_event("error", error_data)
+                )
+                yield sse("error", error_data)
                 logger.error(f"[{idx+1}/{total}] Failed to process {filename}: {e}", exc_info=True)
                 failed += 1
                 continue
@@ -658,14 +960,14 @@ async def process_batch_stream(files: List[UploadFile] = File(...)):
         avg_accuracy = (total_accuracy / successful) if successful > 0 else None
         
         # Send completion event
-        complete_data = SSECompleteEvent(
+        complete_data = SSECompleteEvent.model_construct(
             total=total,
             successful=successful,
             failed=failed,
             average_accuracy=avg_accuracy,
             processing_time_seconds=round(processing_time, 2)
-        ).model_dump()
-        yield format_sse_event("complete", complete_data)
+        )
+        yield sse("complete", complete_data)
         
         logger.info(f"SSE batch stream complete: {successful}/{total} successful, {failed} failed, {processing_time:.2f}s")
     
@@ -715,6 +1017,11 @@ async def process_batch_fast(files: List[UploadFile] = File(...)):
     
     async def event_generator():
         """Generate SSE events with parallel processing"""
+        # Bind hot-loop globals to locals once per stream (unvalidated, as above)
+        progress_event = SSEProgressEvent.model_construct
+        error_event = SSEErrorEvent.model_construct
+        sse = format_sse_event
+        
         total = len(files)
         successful = 0
         failed = 0
@@ -724,134 +1031,123 @@ async def process_batch_fast(files: List[UploadFile] = File(...)):
         
         logger.info(f"Starting PARALLEL SSE batch stream for {total} images with {settings.max_workers} workers")
         
-        # Read all files first and validate
+        # Read all files first (concurrently) and validate
+        contents = await read_uploads(files)
         file_data_list = []
         for idx, file in enumerate(files):
             filename = file.filename or f"image_{idx}.jpg"
             
             try:
                 # Send progress event - validating
-                progress_data = SSEProgressEvent(
+                progress_data = progress_event(
                     current=idx + 1,
                     total=total,
                     filename=filename,
                     status="validating"
-                ).model_dump()
-                yield format_sse_event("progress", progress_data)
+                )
+                yield sse("progress", progress_data)
                 
                 # Validate file type
-                if not file.content_type or not file.content_type.startswith('image/'):
-                    error_data = SSEErrorEvent(
+                if not is_image_upload(file):
+                    error_data = error_event(
                         index=idx,
                         filename=filename,
                         error="File must be an image (JPG/PNG)",
                         error_type="validation"
-                    ).model_dump()
-                    yield format_sse_event("error", error_data)
+                    )
+                    yield sse("error", error_data)
                     failed += 1
                     continue
                 
-                # Read file content
-                content = await file.read()
+                # File content (read concurrently above)
+                content = contents[idx]
                 
-                # Check file size
-                file_size_mb = len(content) / (1024 * 1024)
-                if file_size_mb > settings.max_file_size_mb:
-                    error_data = SSEErrorEvent(
+                # Check file size (oversized uploads were rejected without being buffered)
+                if isinstance(content, UploadTooLargeError):
+                    error_data = error_event(
                         index=idx,
                         filename=filename,
-                        error=f"File size ({file_size_mb:.1f}MB) exceeds maximum ({settings.max_file_size_mb}MB)",
+                        error=str(content),
                         error_type="validation"
-                    ).model_dump()
-                    yield format_sse_event("error", error_data)
+                    )
+                    yield sse("error", error_data)
                     failed += 1
                     continue
+                if isinstance(content, Exception):
+                    raise content
                 
                 # Add to processing queue
                 file_data_list.append((content, filename, idx))
             
             except Exception as e:
-                error_data = SSEErrorEvent(
+                error_data = error_event(
                     index=idx,
                     filename=filename,
                     error=str(e),
                     error_type="validation"
-                ).model_dump()
-                yield format_sse_event("error", error_data)
+                )
+                yield sse("error", error_data)
                 failed += 1
         
-        # Process in batches using thread pool
-        batch_size = settings.max_workers
+        # Send progress events for every accepted file
+        for content, filename, idx in file_data_list:
+            progress_data = progress_event(
+                current=idx + 1,
+                total=total,
+                filename=filename,
+                status="processing"
+            )
+            yield sse("progress", progress_data)
         
-        with ThreadPoolExecutor(max_workers=settings.max_workers) as executor:
-            # Process in chunks of batch_size
-            for i in range(0, len(file_data_list), batch_size):
-                batch = file_data_list[i:i+batch_size]
-                
-                # Send progress events for batch
-                for content, filename, idx in batch:
-                    progress_data = SSEProgressEvent(
-                        current=idx + 1,
-                        total=total,
-                        filename=filename,
-                        status="processing"
-                    ).model_dump()
-                    yield format_sse_event("progress", progress_data)
-                
-                # Submit batch to executor
-                loop = asyncio.get_event_loop()
-                futures = [
-                    loop.run_in_executor(executor, process_single_image_sync, data)
-                    for data in batch
-                ]
+        # Submit everything to the shared pool - its max_workers bounds concurrency
+        submit = functools.partial(asyncio.get_running_loop().run_in_executor, _BATCH_EXECUTOR)
+        futures = [submit(process_single_image_sync, data) for data in file_data_list]
+        
+        # Stream results as they complete (a slow image doesn't hold back the rest)
+        for future in asyncio.as_completed(futures):
+            result = await future
+            processed_count += 1
+            
+            if result['success']:
+                # Send result event - same body as SSEResultEvent.model_dump_json(),
+                # spliced around the worker's JSON so the decklist isn't re-validated
+                result_data = (
+                    f'{{"index":{result["index"]},"filename":{json.dumps(result["filename"])},'
+                    f'"decklist":{result["decklist_json"]}}}'
+                )
+                yield sse("result", result_data)
                 
-                # Wait for batch to complete
-                results = await asyncio.gather(*futures)
+                successful += 1
                 
-                # Stream results as they complete
-                for result in results:
-                    processed_count += 1
-                    
-                    if result['success']:
-                        # Send result event
-                        result_data = SSEResultEvent(
-                            index=result['index'],
-                            filename=result['filename'],
-                            decklist=DecklistResponse(**result['decklist'])
-                        ).model_dump()
-                        yield format_sse_event("result", result_data)
-                        
-                        successful += 1
-                        
-                        # Track accuracy
-                        if result['decklist'].get('stats'):
-                            accuracy = result['decklist']['stats']['accuracy']
-                            total_accuracy += accuracy
-                            logger.info(f"[{processed_count}/{len(file_data_list)}] Success - {result['filename']} - Accuracy: {accuracy:.2f}%")
-                    else:
-                        # Send error event
-                        error_data = SSEErrorEvent(
-                            index=result['index'],
-                            filename=result['filename'],
-                            error=result['error'],
-                            error_type=result['error_type']
-                        ).model_dump()
-                        yield format_sse_event("error", error_data)
-                        failed += 1
+                # Track accuracy
+                if result['accuracy'] is not None:
+                    accuracy = result['accuracy']
+                    total_accuracy += accuracy
+                    logger.info(f"[{processed_count}/{len(file_data_list)}] Success - {result['filename']} - Accuracy: {accuracy:.2f}%")
+            else:
+                # Send error event
+                error_data = error_event(
+                    index=result['index'],
+                    filename=result['filename'],
+                    error=result['error'],
+                    error_type=result['error_type']
+                )
+                yield sse("error", error_data)
+                failed += 1
         
         # Calculate final statistics
         processing_time = time.time() - start_time
         avg_accuracy = (total_accuracy / successful) if successful > 0 else None
         
         # Send completion event
-        complete_data = SSECompleteEvent(
+        complete_data = SSECompleteEvent.model_construct(
             total=total,
             successful=successful,
             failed=failed,
             average_accuracy=avg_accuracy,
             processing_time_seconds=round(processing_time, 2)
-        ).model_dump()
-        yield format_sse_event("complete", complete_data)
+        )
+        yield sse("complete", complete_data)
         
         speedup = (total * 45) / processing_time if processing_time > 0 else 1  # Assume 45s per image sequential
         logger.info(f"PARALLEL SSE batch complete: {successful}/{total} successful, {failed} failed, {processing_time:.2f}s (~{speedup:.1f}x speedup)")
@@ -867,6 +1163,34 @@ async def process_batch_fast(files: List[UploadFile] = File(...)):
     )
 
 
+class StageError(Exception):
+    """A process-and-save stage raised unexpectedly"""
+    
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(f"{stage} stage: {error}")
+        self.stage = stage
+        self.error = error
+
+
+@contextmanager
+def save_stage(name: str):
+    """
+    Time one process-and-save stage and tag unexpected failures with it
+    
+    Logs the stage's wall time, and re-raises anything other than an
+    HTTPException as StageError(name, error).
+    """
+    start = time.perf_counter_ns()
+    try:
+        yield
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise StageError(name, e) from e
+    finally:
+        logger.info(f"Stage {name}: {(time.perf_counter_ns() - start) / 1e6:.1f}ms")
+
+
 @router.post("/process-and-save")
 async def process_and_save_to_main_api(
     file: UploadFile = File(...),
@@ -895,45 +1219,44 @@ async def process_and_save_to_main_api(
         )
     
     # Validate file type
-    if not file.content_type or not file.content_type.startswith('image/'):
+    if not is_image_upload(file):
         raise HTTPException(
             status_code=400,
             detail="File must be an image (JPG/PNG)"
         )
     
-    # Read file content
-    content = await file.read()
-    file_size_mb = len(content) / (1024 * 1024)
-    if file_size_mb > settings.max_file_size_mb:
+    # Read file content (oversized uploads are rejected before buffering)
+    try:
+        content = await read_upload(file)
+    except UploadTooLargeError as e:
         raise HTTPException(
             status_code=400,
-            detail=f"File size ({file_size_mb:.1f}MB) exceeds maximum ({settings.max_file_size_mb}MB)"
+            detail=str(e)
         )
     
-    # Save to temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
+    logger.info(f"Processing and saving: {file.filename}")
     
     try:
-        logger.info(f"Processing and saving: {file.filename}")
-        
         # Stage 1: Parse image (using direct function from working implementation)
-        parsed = parse_with_two_stage(tmp_path)
+        with save_stage("parse"):
+            parsed = await run_ocr(content)
         
         # Stage 2: Match cards to English
-        matched = matcher.match_decklist(parsed)
+        with save_stage("match"):
+            matched = await match_decklist_async(parsed)
         
         # Stage 3: Map to main API schema
-        deck_schema = main_api_client.map_ocr_to_deck_schema(
-            matched,
-            owner=owner,
-            format_id=format_id
-        )
+        with save_stage("map"):
+            deck_schema = main_api_client.map_ocr_to_deck_schema(
+                matched,
+                owner=owner,
+                format_id=format_id
+            )
         
         # Stage 4: Resolve card IDs (lookup in main API)
         logger.info("Resolving card IDs from main API...")
-        resolved_cards = await main_api_client.resolve_card_ids(deck_schema['cards'])
+        with save_stage("resolve"):
+            resolved_cards = await main_api_client.resolve_card_ids_batch(deck_schema['cards'])
         deck_schema['cards'] = resolved_cards
         
         if len(resolved_cards) == 0:
@@ -944,33 +1267,33 @@ async def process_and_save_to_main_api(
         
         # Stage 5: Create deck in main API
         logger.info(f"Creating deck in main API: {deck_schema['name']}")
-        created_deck = main_api_client.create_deck(deck_schema)
-        
-        if created_deck is None:
+        with save_stage("create"):
+            created_deck = await main_api_client.create_deck(deck_schema)
+    
+    except StageError as e:
+        if e.stage == "parse" and isinstance(e.error, ValueError):
+            # Undecodable upload - a client error, not worth a traceback
+            logger.warning(f"Process and save rejected {file.filename}: {e}")
             raise HTTPException(
-                status_code=500,
-                detail="Failed to create deck in main API"
+                status_code=400,
+                detail=str(e.error)
             )
-        
-        # Add OCR stats to response
-        created_deck['ocr_stats'] = matched.get('stats', {})
-        
-        logger.info(f"Deck created successfully with ID: {created_deck.get('id')}")
-        
-        return created_deck
+        logger.error(f"Process and save failed: {e}", exc_info=e.error)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Processing failed: {e}"
+        )
     
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Process and save failed: {e}", exc_info=True)
+    if created_deck is None:
         raise HTTPException(
             status_code=500,
-            detail=f"Processing failed: {str(e)}"
+            detail="Failed to create deck in main API"
         )
-    finally:
-        # Clean up temp file
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
+    
+    # Add OCR stats to response
+    created_deck['ocr_stats'] = matched.get('stats', {})
+    
+    logger.info(f"Deck created successfully with ID: {created_deck.get('id')}")
+    
+    return created_deck
 
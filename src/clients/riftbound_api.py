@@ -3,12 +3,110 @@ API Client for Riftbound Top Decks API
 Enables integration with the main backend for deck creation
 """
 
+import asyncio
 import httpx
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 import logging
+import time
+
+# Try to import orjson for faster response decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import h2 so card lookups can share one HTTP/2 connection
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Max card lookups in flight at once against the main API
+LOOKUP_CONCURRENCY = 8
+
+# Health check: results are reused for HEALTH_CACHE_TTL seconds, and after
+# HEALTH_FAILURE_THRESHOLD consecutive failures the breaker opens and checks
+# fail fast for HEALTH_BREAKER_COOLDOWN seconds without a request
+HEALTH_CACHE_TTL = 5.0
+HEALTH_FAILURE_THRESHOLD = 3
+HEALTH_BREAKER_COOLDOWN = 30.0
+
+# Decklist sections, in the order their cards are sent to the main API
+_SECTIONS = ('legend', 'main_deck', 'battlefields', 'runes', 'side_deck')
+
+# name_en placeholder for a card that couldn't be matched
+_UNKNOWN = 'UNKNOWN'
+
+# Seconds the formats list is reused before /formats is fetched again
+FORMATS_TTL = 3600.0
+
+
+def _response_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+class CardLookupCache:
+    """
+    LRU cache of card lookups from the main API, with a TTL
+    
+    Only found cards are stored - a miss or an HTTP error is always retried
+    against the API. Keys are normalized with strip().lower().
+    """
+    
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict]]" = OrderedDict()
+    
+    @staticmethod
+    def key(kind: str, value: str) -> Tuple[str, str]:
+        """Cache key for a 'number' or 'name' lookup"""
+        return kind, value.strip().lower()
+    
+    def get(self, key: Tuple[str, str]) -> Optional[Dict]:
+        """Cached card for `key`, or None if absent or expired"""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() > entry[0]:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def put(self, key: Tuple[str, str], card: Dict):
+        """Store a found card"""
+        self._entries[key] = (time.monotonic() + self.ttl, card)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        self._entries.clear()
+        self.hits = self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize
+        }
+
 
 class RiftboundAPIClient:
     """
@@ -30,34 +128,73 @@ class RiftboundAPIClient:
         self.api_key = api_key
         self.timeout = timeout
         
+        # Cleared the first time the main API answers /cards/lookup with 404/405
+        self._batch_lookup_supported = True
+        
+        # Card number/name -> card data (the card catalogue rarely changes)
+        self.card_cache = CardLookupCache()
+        
+        # Lowercased format name -> format, loaded from /formats on first use
+        self._formats_by_name: Optional[Dict[str, Dict]] = None
+        self._formats_loaded_at = 0.0
+        
+        # Health check cache and circuit breaker state
+        self._health_cache: Optional[Tuple[float, bool]] = None
+        self._health_failures = 0
+        self._breaker_open_until = 0.0
+        
         # Create HTTP client
         headers = {}
         if api_key:
             headers['X-API-Key'] = api_key
         
-        self.client = httpx.Client(
+        # Async so calls never block the event loop - one instance so
+        # concurrent requests share keep-alive connections (multiplexed over
+        # HTTP/2 when h2 is installed); failed connects are retried once
+        self.client = httpx.AsyncClient(
             base_url=self.base_url,
             headers=headers,
-            timeout=timeout
+            timeout=timeout,
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=32,
+                    max_keepalive_connections=32,
+                    keepalive_expiry=60
+                ),
+                retries=1
+            )
         )
         
         logger.info(f"RiftboundAPIClient initialized: {base_url}")
     
-    def close(self):
+    async def warm_up(self):
+        """
+        Open a connection to the main API ahead of the first lookup
+        
+        Issues GET /health so the TCP/TLS (and ALPN) handshake is done before
+        any user request needs it. Failures are ignored.
+        """
+        try:
+            await self.client.get("/health")
+        except httpx.HTTPError as e:
+            logger.warning(f"Main API warm-up request failed: {e}")
+    
+    async def aclose(self):
         """Close HTTP client"""
-        self.client.close()
+        await self.client.aclose()
     
-    def __enter__(self):
-        """Context manager entry"""
+    async def __aenter__(self):
+        """Async context manager entry"""
         return self
     
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit"""
-        self.close()
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.aclose()
     
     # Card Operations
     
-    def get_card_by_name(self, name: str) -> Optional[Dict]:
+    async def get_card_by_name(self, name: str) -> Optional[Dict]:
         """
         Get card by name from main API
         
@@ -67,12 +204,18 @@ class RiftboundAPIClient:
         Returns:
             Card data dict or None if not found
         """
+        key = self.card_cache.key('name', name)
+        card = self.card_cache.get(key)
+        if card is not None:
+            return card
+        
         try:
-            response = self.client.get(f"/cards/search", params={"q": name})
+            response = await self.client.get(f"/cards/search", params={"q": name})
             response.raise_for_status()
             
-            results = response.json()
+            results = _response_json(response)
             if results and len(results) > 0:
+                self.card_cache.put(key, results[0])
                 return results[0]
             return None
             
@@ -80,7 +223,7 @@ class RiftboundAPIClient:
             logger.error(f"Failed to lookup card '{name}': {e}")
             return None
     
-    def get_card_by_number(self, card_number: str) -> Optional[Dict]:
+    async def get_card_by_number(self, card_number: str) -> Optional[Dict]:
         """
         Get card by card number from main API
         
@@ -90,12 +233,18 @@ class RiftboundAPIClient:
         Returns:
             Card data dict or None if not found
         """
+        key = self.card_cache.key('number', card_number)
+        card = self.card_cache.get(key)
+        if card is not None:
+            return card
+        
         try:
-            response = self.client.get(f"/cards", params={"card_number": card_number})
+            response = await self.client.get(f"/cards", params={"card_number": card_number})
             response.raise_for_status()
             
-            results = response.json()
+            results = _response_json(response)
             if results and len(results) > 0:
+                self.card_cache.put(key, results[0])
                 return results[0]
             return None
             
@@ -105,7 +254,7 @@ class RiftboundAPIClient:
     
     # Deck Operations
     
-    def create_deck(self, deck_data: Dict) -> Optional[Dict]:
+    async def create_deck(self, deck_data: Dict) -> Optional[Dict]:
         """
         Create deck in main API
         
@@ -128,10 +277,10 @@ class RiftboundAPIClient:
         try:
             logger.info(f"Creating deck: {deck_data.get('name', 'Unknown')}")
             
-            response = self.client.post("/decks", json=deck_data)
+            response = await self.client.post("/decks", json=deck_data)
             response.raise_for_status()
             
-            created_deck = response.json()
+            created_deck = _response_json(response)
             logger.info(f"Deck created successfully with ID: {created_deck.get('id')}")
             
             return created_deck
@@ -142,7 +291,7 @@ class RiftboundAPIClient:
                 logger.error(f"Response: {e.response.text}")
             return None
     
-    def get_deck(self, deck_id: int) -> Optional[Dict]:
+    async def get_deck(self, deck_id: int) -> Optional[Dict]:
         """
         Get deck by ID from main API
         
@@ -153,10 +302,10 @@ class RiftboundAPIClient:
             Deck data dict or None if not found
         """
         try:
-            response = self.client.get(f"/decks/{deck_id}")
+            response = await self.client.get(f"/decks/{deck_id}")
             response.raise_for_status()
             
-            return response.json()
+            return _response_json(response)
             
         except httpx.HTTPError as e:
             logger.error(f"Failed to get deck {deck_id}: {e}")
@@ -164,7 +313,7 @@ class RiftboundAPIClient:
     
     # Format Operations
     
-    def get_formats(self) -> List[Dict]:
+    async def get_formats(self) -> List[Dict]:
         """
         Get available game formats
         
@@ -172,16 +321,16 @@ class RiftboundAPIClient:
             List of format dicts
         """
         try:
-            response = self.client.get("/formats")
+            response = await self.client.get("/formats")
             response.raise_for_status()
             
-            return response.json()
+            return _response_json(response)
             
         except httpx.HTTPError as e:
             logger.error(f"Failed to get formats: {e}")
             return []
     
-    def get_format_by_name(self, name: str) -> Optional[Dict]:
+    async def get_format_by_name(self, name: str) -> Optional[Dict]:
         """
         Get format by name
         
@@ -191,11 +340,17 @@ class RiftboundAPIClient:
         Returns:
             Format dict or None if not found
         """
-        formats = self.get_formats()
-        for fmt in formats:
-            if fmt.get('name', '').lower() == name.lower():
-                return fmt
-        return None
+        if self._formats_by_name is None or time.monotonic() - self._formats_loaded_at > FORMATS_TTL:
+            formats = await self.get_formats()
+            if formats:
+                # Reversed so the first format with a given name wins
+                self._formats_by_name = {fmt.get('name', '').lower(): fmt for fmt in reversed(formats)}
+                self._formats_loaded_at = time.monotonic()
+            elif self._formats_by_name is None:
+                # Nothing cached and the fetch failed - retry on the next call
+                return None
+        
+        return self._formats_by_name.get(name.lower())
     
     # Utility Methods
     
@@ -218,19 +373,21 @@ class RiftboundAPIClient:
         Returns:
             Deck data dict ready for create_deck()
         """
+        metadata = ocr_result.get('metadata') or {}
+        
         # Extract legend name
         legend = "Unknown"
-        if ocr_result.get('legend') and len(ocr_result['legend']) > 0:
-            legend_card = ocr_result['legend'][0]
-            legend = legend_card.get('name_en', 'Unknown')
+        legend_cards = ocr_result.get('legend')
+        if legend_cards:
+            legend = legend_cards[0].get('name_en', 'Unknown')
             # Extract just the name before comma if present
             if ',' in legend:
                 legend = legend.split(',')[0].strip()
         
         # Generate deck name if not provided
         if not deck_name:
-            placement = ocr_result.get('metadata', {}).get('placement')
-            event = ocr_result.get('metadata', {}).get('event', 'Tournament')
+            placement = metadata.get('placement')
+            event = metadata.get('event', 'Tournament')
             if placement:
                 deck_name = f"{legend} - #{placement} {event}"
             else:
@@ -241,28 +398,30 @@ class RiftboundAPIClient:
         # For now, we'll structure the data and note that card IDs need resolution
         
         cards_to_create = []
+        total_size = 0
         
-        # Process each section
-        for section_name in ['legend', 'main_deck', 'battlefields', 'runes', 'side_deck']:
-            cards = ocr_result.get(section_name, [])
-            for card in cards:
+        # Process each section (deck size is summed in the same pass)
+        for section_name in _SECTIONS:
+            for card in ocr_result.get(section_name, ()):
+                name_en = card.get('name_en')
+                
                 # Skip unmatched cards
-                if card.get('name_en') == 'UNKNOWN':
+                if name_en == _UNKNOWN:
                     logger.warning(f"Skipping unmatched card: {card.get('name_cn')}")
                     continue
                 
+                quantity = card.get('quantity', 1)
+                total_size += quantity
+                
                 # Note: This requires card_id from main API
                 # In production, we'd look up each card by card_number or name
                 cards_to_create.append({
                     'card_number': card.get('card_number'),  # For lookup
-                    'name_en': card.get('name_en'),  # For lookup
-                    'quantity': card.get('quantity', 1),
+                    'name_en': name_en,  # For lookup
+                    'quantity': quantity,
                     'section': section_name
                 })
         
-        # Calculate total size
-        total_size = sum(card['quantity'] for card in cards_to_create)
-        
         return {
             'name': deck_name,
             'legend': legend,
@@ -270,35 +429,106 @@ class RiftboundAPIClient:
             'format_id': format_id,
             'size': total_size,
             'cards': cards_to_create,  # Note: Requires card_id resolution
-            'metadata': ocr_result.get('metadata', {}),
+            'metadata': metadata,
             'stats': ocr_result.get('stats', {})
         }
     
-    async def resolve_card_ids(self, cards: List[Dict]) -> List[Dict]:
+    async def lookup_cards_batch(self, cards: List[Dict]) -> Optional[List[Optional[Dict]]]:
         """
-        Resolve card IDs from card numbers or names
+        Look up many cards in a single request via POST /cards/lookup
+        
+        The endpoint takes {"cards": [{"card_number", "name_en"}, ...]} and
+        returns a list aligned with the input (null where no card matched).
         
         Args:
             cards: List of card dicts with 'card_number' or 'name_en'
             
         Returns:
-            List of card dicts with 'card_id' added
+            Card data dicts (or None) in input order, or None if the batch
+            call is unavailable
         """
-        resolved = []
+        if not self._batch_lookup_supported:
+            return None
+        
+        body = {
+            'cards': [
+                {'card_number': card.get('card_number'), 'name_en': card.get('name_en')}
+                for card in cards
+            ]
+        }
+        
+        try:
+            response = await self.client.post("/cards/lookup", json=body)
+            if response.status_code in (404, 405):
+                # Main API has no batch endpoint - stop trying it
+                logger.info("Main API has no /cards/lookup endpoint, using per-card lookups")
+                self._batch_lookup_supported = False
+                return None
+            response.raise_for_status()
+            
+            results = _response_json(response)
+            if not isinstance(results, list) or len(results) != len(cards):
+                logger.error("Batch card lookup returned a malformed response")
+                return None
+            return results
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Batch card lookup failed: {e}")
+            return None
+    
+    async def _lookup_cards(self, cards: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Look up cards one request each, concurrently (at most
+        LOOKUP_CONCURRENCY in flight), by card number then by name
+        
+        Returns card data dicts (or None) in input order
+        """
+        semaphore = asyncio.Semaphore(LOOKUP_CONCURRENCY)
         
-        for card_data in cards:
+        async def lookup(card_data: Dict) -> Optional[Dict]:
             card_number = card_data.get('card_number')
             name_en = card_data.get('name_en')
             
-            # Try lookup by card number first
-            card_info = None
-            if card_number:
-                card_info = self.get_card_by_number(card_number)
-            
-            # Fallback to name lookup
-            if not card_info and name_en:
-                card_info = self.get_card_by_name(name_en)
+            async with semaphore:
+                # Try lookup by card number first
+                card_info = None
+                if card_number:
+                    card_info = await self.get_card_by_number(card_number)
+                
+                # Fallback to name lookup
+                if not card_info and name_en:
+                    card_info = await self.get_card_by_name(name_en)
             
+            return card_info
+        
+        return await asyncio.gather(*(lookup(card_data) for card_data in cards))
+    
+    def _cached_card(self, card_data: Dict) -> Optional[Dict]:
+        """Cached card data by card number (preferred) or name"""
+        card_number = card_data.get('card_number')
+        if card_number:
+            card = self.card_cache.get(self.card_cache.key('number', card_number))
+            if card is not None:
+                return card
+        name_en = card_data.get('name_en')
+        if name_en:
+            return self.card_cache.get(self.card_cache.key('name', name_en))
+        return None
+    
+    def _cache_card(self, card_data: Dict, card_info: Dict):
+        """Cache a batch result under the card's number, or its name without one"""
+        card_number = card_data.get('card_number')
+        if card_number:
+            self.card_cache.put(self.card_cache.key('number', card_number), card_info)
+        elif card_data.get('name_en'):
+            self.card_cache.put(self.card_cache.key('name', card_data['name_en']), card_info)
+    
+    @staticmethod
+    def _with_card_ids(cards: List[Dict], card_infos: List[Optional[Dict]]) -> List[Dict]:
+        """Pair cards with their looked-up info, dropping unresolved cards"""
+        resolved = []
+        
+        for card_data, card_info in zip(cards, card_infos):
             if card_info:
                 resolved.append({
                     'card_id': card_info['id'],
@@ -306,24 +536,90 @@ class RiftboundAPIClient:
                     'section': card_data['section']
                 })
             else:
-                logger.warning(f"Could not resolve card: {name_en} ({card_number})")
+                logger.warning(f"Could not resolve card: {card_data.get('name_en')} ({card_data.get('card_number')})")
         
         return resolved
     
-    def health_check(self) -> bool:
+    async def resolve_card_ids(self, cards: List[Dict]) -> List[Dict]:
+        """
+        Resolve card IDs from card numbers or names
+        
+        Lookups run concurrently (at most LOOKUP_CONCURRENCY in flight);
+        the result keeps the input order.
+        
+        Args:
+            cards: List of card dicts with 'card_number' or 'name_en'
+            
+        Returns:
+            List of card dicts with 'card_id' added
+        """
+        return self._with_card_ids(cards, await self._lookup_cards(cards))
+    
+    async def resolve_card_ids_batch(self, cards: List[Dict]) -> List[Dict]:
+        """
+        Resolve card IDs with one batch request, falling back to per-card
+        lookups for anything the batch call didn't resolve
+        
+        Args:
+            cards: List of card dicts with 'card_number' or 'name_en'
+            
+        Returns:
+            List of card dicts with 'card_id' added
+        """
+        if not self._batch_lookup_supported:
+            return await self.resolve_card_ids(cards)
+        
+        # Cards seen recently don't need to go into the batch request
+        card_infos = [self._cached_card(card_data) for card_data in cards]
+        uncached = [i for i, card_info in enumerate(card_infos) if not card_info]
+        if uncached:
+            batch = await self.lookup_cards_batch([cards[i] for i in uncached]) or ()
+            for i, card_info in zip(uncached, batch):
+                if card_info:
+                    card_infos[i] = card_info
+                    self._cache_card(cards[i], card_info)
+        
+        missing = [i for i, card_info in enumerate(card_infos) if not card_info]
+        if missing:
+            found = await self._lookup_cards([cards[i] for i in missing])
+            for i, card_info in zip(missing, found):
+                card_infos[i] = card_info
+        
+        return self._with_card_ids(cards, card_infos)
+    
+    async def health_check(self) -> bool:
         """
         Check if main API is accessible
         
+        A result is reused for HEALTH_CACHE_TTL seconds. After
+        HEALTH_FAILURE_THRESHOLD failures in a row the check returns False
+        without a request for HEALTH_BREAKER_COOLDOWN seconds, so an outage
+        doesn't make every caller wait out the full timeout.
+        
         Returns:
             True if API is healthy, False otherwise
         """
-        try:
-            response = self.client.get("/health")
-            return response.status_code == 200
-        except:
+        now = time.monotonic()
+        if now < self._breaker_open_until:
             return False
-
-
-
-
-
+        if self._health_cache is not None and now - self._health_cache[0] < HEALTH_CACHE_TTL:
+            return self._health_cache[1]
+        
+        try:
+            response = await self.client.get("/health")
+            healthy = response.status_code == 200
+        except httpx.HTTPError as e:
+            logger.warning(f"Main API health check failed: {e}")
+            healthy = False
+        
+        if healthy:
+            self._health_failures = 0
+        else:
+            self._health_failures += 1
+            if self._health_failures >= HEALTH_FAILURE_THRESHOLD:
+                logger.warning(f"Main API unhealthy {self._health_failures}x, skipping checks for {HEALTH_BREAKER_COOLDOWN:.0f}s")
+                self._breaker_open_until = now + HEALTH_BREAKER_COOLDOWN
+                self._health_failures = 0
+        
+        self._health_cache = (now, healthy)
+        return healthy
@@ -4,6 +4,7 @@ Loads settings from environment variables
 """
 
 import os
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
@@ -13,8 +14,8 @@ class Settings(BaseSettings):
     
     # Service Configuration
     service_host: str = "0.0.0.0"
-    # Railway uses PORT, we use SERVICE_PORT - check both
-    service_port: int = int(os.getenv("PORT") or os.getenv("SERVICE_PORT") or "8002")
+    # Railway uses PORT, we use SERVICE_PORT - check both (PORT wins)
+    service_port: int = Field(8002, validation_alias=AliasChoices("PORT", "SERVICE_PORT"))
     debug: bool = False
     
     # OCR Settings
@@ -32,6 +33,7 @@ class Settings(BaseSettings):
     # Parallel Processing Settings (Phase 9)
     enable_parallel: bool = False  # Enable parallel batch processing
     max_workers: int = 2  # Number of parallel workers (2-4 recommended for CPU, 1-2 for GPU)
+    image_pool_size: int = 4  # Reusable mask buffers kept for image processing (src/ocr/buffers.py)
     
     # Model Cache Paths
     paddleocr_model_path: str = "/root/.paddlex"
@@ -39,6 +41,10 @@ class Settings(BaseSettings):
     
     # Card Mapping Path
     card_mapping_path: str = "resources/card_mappings_final.csv"
+    # Pickled matcher indexes, keyed by the CSV hash (None = rebuild every start)
+    matcher_cache_dir: Optional[str] = ".cache"
+    # Metadata OCR results keyed by image content (None = disabled; for re-runs on the same screenshots)
+    metadata_cache_dir: Optional[str] = None
     
     # Application Info
     app_name: str = "RiftboundOCR Service"
@@ -49,6 +55,7 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
+        env_ignore_empty=True,  # An empty PORT= falls through to SERVICE_PORT / the default
         extra="ignore"
     )
 
@@ -5,19 +5,41 @@ RiftboundOCR Service - Convert Chinese decklist screenshots to structured deck d
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 import logging
+import queue
 import sys
-
-from src.api.routes import router
+from logging.handlers import QueueHandler, QueueListener
+
+# Try to import psutil for keep-alive resource logging
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+from src.api.routes import (
+    APIJSONResponse,
+    router,
+    rss_sampler,
+    shutdown_batch_executor,
+    warm_up_main_api_client,
+    close_main_api_client,
+)
 from src.config import settings
 
-# Configure logging
+# Configure logging - records go through a queue and a background listener
+# thread writes them to stdout, so request handlers never block on log I/O
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stdout_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, _stdout_handler)
+_log_listener.start()
+
 logging.basicConfig(
     level=logging.INFO if settings.enable_logging else logging.WARNING,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format='%(message)s',  # Final formatting happens on the stdout handler
     handlers=[
-        logging.StreamHandler(sys.stdout)
+        QueueHandler(_log_queue)
     ]
 )
 
@@ -30,7 +52,8 @@ app = FastAPI(
     version=settings.app_version,
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=APIJSONResponse
 )
 
 # CORS middleware - Allow all origins for now (can restrict later)
@@ -62,6 +85,12 @@ async def startup_event():
         # Start background keep-alive logger
         import asyncio
         asyncio.create_task(keep_alive_logger())
+        
+        # Background RSS sampling for per-request memory logging
+        asyncio.create_task(rss_sampler())
+        
+        # Connect to the main API in the background so the first lookup doesn't pay the handshake
+        asyncio.create_task(warm_up_main_api_client())
     except Exception as e:
         logger.error(f"❌ Startup error: {e}", exc_info=True)
         raise
@@ -74,27 +103,35 @@ async def keep_alive_logger():
     start_time = time.time()
     counter = 0
     
+    process = psutil.Process() if PSUTIL_AVAILABLE else None
+    if process is not None:
+        # Prime the CPU counter - each later call reports usage since the previous one
+        process.cpu_percent(interval=None)
+    
     while True:
         await asyncio.sleep(60)  # Log every 60 seconds
         counter += 1
         uptime = int(time.time() - start_time)
         logger.info(f"💓 Keep-alive #{counter} - Uptime: {uptime}s ({uptime//60}m {uptime%60}s)")
         
-        # Log memory usage if available
-        try:
-            import psutil
-            process = psutil.Process()
-            memory_mb = process.memory_info().rss / 1024 / 1024
-            cpu_percent = process.cpu_percent(interval=1)
-            logger.info(f"📊 Resources: Memory={memory_mb:.1f}MB, CPU={cpu_percent:.1f}%")
-        except:
-            pass
+        # Log memory usage if available (CPU is averaged over the last minute,
+        # without blocking the loop)
+        if process is not None:
+            try:
+                memory_mb = process.memory_info().rss / 1024 / 1024
+                cpu_percent = process.cpu_percent(interval=None)
+                logger.info(f"📊 Resources: Memory={memory_mb:.1f}MB, CPU={cpu_percent:.1f}%")
+            except psutil.Error:
+                pass
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown"""
     logger.info("Service shutting down...")
+    shutdown_batch_executor()
+    await close_main_api_client()
+    _log_listener.stop()  # Flush queued log records
 
 
 @app.get("/")
@@ -142,7 +179,7 @@ async def health_simple():
 async def global_exception_handler(request, exc):
     """Global exception handler"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return APIJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -3,7 +3,7 @@ Pydantic Schemas for API Request/Response Validation
 """
 
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import ClassVar, List, Optional
 from datetime import date
 
 
@@ -28,6 +28,7 @@ class CardData(BaseModel):
     match_type: Optional[str] = Field(None, description="Match strategy used")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "name_cn": "易, 锋芒毕现",
@@ -56,6 +57,7 @@ class DecklistMetadata(BaseModel):
     legend_name_en: Optional[str] = Field(None, description="Matched English legend name")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "player": "Ai.闪闪",
@@ -77,6 +79,7 @@ class DecklistStats(BaseModel):
     accuracy: float = Field(..., ge=0, le=100, description="Match accuracy percentage")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "total_cards": 63,
@@ -99,7 +102,30 @@ class DecklistResponse(BaseModel):
     side_deck: List[CardData] = Field(default_factory=list, description="Side deck cards (0-8)")
     stats: Optional[DecklistStats] = Field(None, description="Accuracy statistics")
     
+    SECTIONS: ClassVar[tuple] = ('legend', 'main_deck', 'battlefields', 'runes', 'side_deck')
+    
+    @classmethod
+    def build_trusted(cls, data: dict) -> "DecklistResponse":
+        """
+        Build from our own matcher output without re-validating it
+        
+        Nested models are assembled with model_construct, so serialization
+        and attribute access behave as for a validated instance. Only for
+        data produced in-process - anything from clients must be validated.
+        """
+        stats = data.get('stats')
+        return cls.model_construct(
+            decklist_id=data.get('decklist_id'),
+            metadata=DecklistMetadata.model_construct(**data['metadata']),
+            stats=DecklistStats.model_construct(**stats) if stats else None,
+            **{
+                section: [CardData.model_construct(**card) for card in data.get(section, ())]
+                for section in cls.SECTIONS
+            }
+        )
+    
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "decklist_id": "550e8400-e29b-41d4-a716-446655440000",
@@ -141,6 +167,7 @@ class BatchProcessResponse(BaseModel):
     results: List[DecklistResponse] = Field(default_factory=list, description="Individual decklist results")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "total": 5,
@@ -163,6 +190,7 @@ class HealthResponse(BaseModel):
     total_cards_in_db: int = Field(..., description="Total cards in mapping database")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "status": "healthy",
@@ -180,8 +208,10 @@ class StatsResponse(BaseModel):
     
     matcher: dict = Field(..., description="Matcher statistics")
     parser: dict = Field(..., description="Parser statistics")
+    cache: Optional[dict] = Field(None, description="In-process cache statistics")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "matcher": {
@@ -207,6 +237,7 @@ class ErrorResponse(BaseModel):
     code: Optional[str] = Field(None, description="Error code")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "error": "Processing failed",
@@ -230,6 +261,7 @@ class SSEProgressEvent(BaseModel):
     status: str = Field(..., description="Processing status (processing, validating, etc.)")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "current": 3,
@@ -249,6 +281,7 @@ class SSEResultEvent(BaseModel):
     decklist: DecklistResponse = Field(..., description="Processed decklist data")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "index": 2,
@@ -277,6 +310,7 @@ class SSEErrorEvent(BaseModel):
     error_type: str = Field(..., description="Type of error (validation, processing, etc.)")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "index": 5,
@@ -298,6 +332,7 @@ class SSECompleteEvent(BaseModel):
     processing_time_seconds: Optional[float] = Field(None, ge=0, description="Total processing time")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "total": 10,
@@ -310,4 +345,8 @@ class SSECompleteEvent(BaseModel):
     )
 
 
-
+# Schemas are built lazily (defer_build) - except the decklist models, which
+# every processing request uses, so their first request doesn't pay for it
+for _model in (CardData, DecklistMetadata, DecklistStats, DecklistResponse):
+    _model.model_rebuild()
+del _model
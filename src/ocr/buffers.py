@@ -0,0 +1,52 @@
+"""
+Reusable scratch buffers for image processing
+Avoids reallocating full-size mask arrays for every section of every image
+"""
+
+import queue
+from typing import Tuple
+
+import numpy as np
+
+from src.config import settings
+
+
+class BufferPool:
+    """
+    Bounded pool of flat scratch arrays handed out as shaped views
+
+    acquire() reuses the most recently released buffer when it is big enough
+    and only allocates otherwise; release() returns it (or drops it when the
+    pool is full). Safe to share across worker threads.
+    """
+
+    def __init__(self, maxsize: int = 4):
+        self._buffers = queue.LifoQueue(maxsize=maxsize)
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Get a C-contiguous array of `shape` (contents are undefined)"""
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+
+        try:
+            buf = self._buffers.get_nowait()
+        except queue.Empty:
+            buf = None
+
+        if buf is None or buf.nbytes < nbytes:
+            # Too small (or none free) - allocate, the old one is garbage collected
+            buf = np.empty(nbytes, dtype=np.uint8)
+
+        return buf[:nbytes].view(dtype).reshape(shape)
+
+    def release(self, arr: np.ndarray):
+        """Return an array obtained from acquire() to the pool"""
+        base = arr.base if arr.base is not None else arr
+        try:
+            self._buffers.put_nowait(base)
+        except queue.Full:
+            pass
+
+
+# Shared pool for the section / card-box mask arrays
+mask_pool = BufferPool(maxsize=settings.image_pool_size)
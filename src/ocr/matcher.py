@@ -2,54 +2,313 @@
 Match Chinese card names to English using the card mapping database
 """
 import csv
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import defaultdict
 from rapidfuzz import fuzz, process
-from typing import Dict, List, Optional
+import numpy as np
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
 import sys
+import threading
+
+# Try to import pyarrow for native, column-oriented CSV loading
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
+
+class CardRow(NamedTuple):
+    """One card variant from the mapping CSV"""
+    name_en: str
+    card_number: str
+    type_en: str
+    domain_en: str
+    cost: str
+    rarity_en: str
+    image_url_en: str
+
+
+# Cap on memoized match() results (oldest evicted first)
+MATCH_CACHE_SIZE = 4096
+
+# Match cache miss marker (None is a cached "no match")
+_MISSING = object()
+
+# Bump when the pickled index layout changes (invalidates cached files)
+INDEX_CACHE_VERSION = 2
+
+# Attributes built from the CSV that the index cache stores
+_INDEX_ATTRS = (
+    'mappings', 'base_name_mappings', 'chinese_names', '_base_best', '_no_comma',
+    '_base_names', '_base_bigrams', '_base_by_length',
+    '_full_names', '_full_bigrams', '_full_by_length',
+)
+
+
+# CSV columns read per row: the Chinese name, then the CardRow fields
+_CSV_COLUMNS = ('name_cn',) + CardRow._fields
+
+
+def _card_number_key(card: CardRow) -> str:
+    """Sort key putting the variant with the lowest card number first"""
+    return card.card_number
+
+
+def _read_mapping_rows(mapping_file: str) -> Iterable[tuple]:
+    """
+    (name_cn, *CardRow fields) for every row of the mapping CSV
+    
+    Parsed by pyarrow in native code when installed; files it rejects
+    (ragged rows, no image_url_en column) go through csv.DictReader.
+    """
+    if PYARROW_AVAILABLE:
+        try:
+            return _read_mapping_rows_arrow(mapping_file)
+        except pa.ArrowException:
+            pass
+    return _read_mapping_rows_csv(mapping_file)
+
+
+def _read_mapping_rows_arrow(mapping_file: str) -> Iterable[tuple]:
+    """pyarrow reader - every column as a string, a UTF-8 BOM is skipped"""
+    with open(mapping_file, 'rb') as f:
+        table = pa_csv.read_csv(
+            f,
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in _CSV_COLUMNS},
+                include_columns=list(_CSV_COLUMNS)
+            )
+        )
+    return zip(*(table.column(name).to_pylist() for name in _CSV_COLUMNS))
+
+
+def _read_mapping_rows_csv(mapping_file: str) -> Iterable[tuple]:
+    """Stdlib reader (one dict per row)"""
+    with open(mapping_file, 'r', encoding='utf-8-sig') as f:
+        return [
+            (
+                row['name_cn'],
+                row['name_en'],
+                row['card_number'],
+                row['type_en'],
+                row['domain_en'],
+                row['cost'],
+                row['rarity_en'],
+                row.get('image_url_en', '')
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
 class CardMatcher:
-    def __init__(self, mapping_file='card-mapping-complete/final_data/card_mappings_final.csv'):
-        """Load card mappings from CSV"""
-        self.mappings = {}  # Full name -> card data
-        self.base_name_mappings = {}  # Base name (no tagline) -> list of full names
-        self.chinese_names = []
-        
-        with open(mapping_file, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                name_cn = row['name_cn']
-                card_data = {
-                    'name_en': row['name_en'],
-                    'card_number': row['card_number'],
-                    'type_en': row['type_en'],
-                    'domain_en': row['domain_en'],
-                    'cost': row['cost'],
-                    'rarity_en': row['rarity_en'],
-                    'image_url_en': row.get('image_url_en', '')
-                }
-                
-                # Store full name mapping
-                if name_cn in self.mappings:
-                    if not isinstance(self.mappings[name_cn], list):
-                        self.mappings[name_cn] = [self.mappings[name_cn]]
-                    self.mappings[name_cn].append(card_data)
-                else:
-                    self.mappings[name_cn] = card_data
-                
-                if name_cn not in self.chinese_names:
-                    self.chinese_names.append(name_cn)
-                
-                # Store base name mapping (without tagline)
-                base_name = name_cn.split(',')[0].strip()
-                if base_name not in self.base_name_mappings:
-                    self.base_name_mappings[base_name] = []
-                self.base_name_mappings[base_name].append(name_cn)
+    def __init__(self, mapping_file='card-mapping-complete/final_data/card_mappings_final.csv',
+                 cache_dir: Optional[str] = None):
+        """
+        Load card mappings from CSV
+        
+        With cache_dir set, the built indexes are pickled there keyed by the
+        CSV's content hash and loaded directly on later starts.
+        """
+        cache_path = self._index_cache_path(mapping_file, cache_dir) if cache_dir else None
+        if cache_path is None or not self._load_index(cache_path):
+            self._load_mappings(mapping_file)
+            if cache_path is not None:
+                self._save_index(cache_path)
+        
+        # (name, threshold) -> match() result; OCR repeats the same names
+        # across sections and images, so most lookups end here
+        self._match_cache: Dict[tuple, Optional[Dict]] = {}
+        self._match_cache_lock = threading.Lock()
         
         print(f"✓ Loaded {len(self.mappings)} card mappings")
         print(f"✓ Indexed {len(self.base_name_mappings)} base names")
     
+    @staticmethod
+    def _index_cache_path(mapping_file: str, cache_dir: str) -> str:
+        """Cache file for this exact CSV content"""
+        with open(mapping_file, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        return os.path.join(cache_dir, f"matcher_v{INDEX_CACHE_VERSION}_{digest}.pkl")
+    
+    def _load_index(self, cache_path: str) -> bool:
+        """Restore the indexes from cache_path; False if missing or unreadable"""
+        try:
+            with open(cache_path, 'rb') as f:
+                index = pickle.load(f)
+            for attr in _INDEX_ATTRS:
+                setattr(self, attr, index[attr])
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"⚠ Ignoring unreadable matcher cache {cache_path}: {e}")
+            return False
+        return True
+    
+    def _save_index(self, cache_path: str):
+        """Write the indexes to cache_path atomically (best effort)"""
+        cache_dir = os.path.dirname(cache_path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump({attr: getattr(self, attr) for attr in _INDEX_ATTRS},
+                                f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError as e:
+            print(f"⚠ Could not write matcher cache {cache_path}: {e}")
+    
+    def _load_mappings(self, mapping_file: str):
+        """Parse the CSV and build every index"""
+        self.mappings = {}  # Full name -> tuple of CardRow, lowest card number first
+        self.base_name_mappings = {}  # Base name (no tagline) -> list of full names
+        
+        variants = defaultdict(list)
+        
+        for name_cn, *fields in _read_mapping_rows(mapping_file):
+            card_data = CardRow(*fields)
+            
+            # Store full name mapping
+            variants[name_cn].append(card_data)
+            
+            # Store base name mapping (without tagline)
+            base_name = name_cn.split(',')[0].strip()
+            if base_name not in self.base_name_mappings:
+                self.base_name_mappings[base_name] = []
+            self.base_name_mappings[base_name].append(name_cn)
+        
+        # Sort each name's variants once (stable - ties keep CSV order)
+        self.mappings = {
+            name_cn: tuple(sorted(cards, key=_card_number_key))
+            for name_cn, cards in variants.items()
+        }
+        self.chinese_names = list(self.mappings)
+        
+        self._build_lookup_index()
+    
+    def _build_lookup_index(self):
+        """
+        Resolve every lookup once at load time
+        
+        match() used to rebuild the base-name candidate list and re-sort the
+        variants on every call; these hash maps hold the final answers.
+        """
+        # Base name -> (best card data across all variants, first full name)
+        self._base_best = {
+            base_name: (
+                min((self.mappings[full_name][0] for full_name in full_names), key=_card_number_key),
+                full_names[0]
+            )
+            for base_name, full_names in self.base_name_mappings.items()
+        }
+        
+        # Comma-less reading -> full name, for Strategy 3 (a champion name read
+        # as one line). Mirrors inserting ", " after the first 1/2/3 characters:
+        # the query must be >= 3 characters long and the earliest position wins.
+        self._no_comma = {}
+        for split_pos in (1, 2, 3):
+            for name_cn in self.mappings:
+                if name_cn[split_pos:split_pos + 2] == ', ':
+                    joined = name_cn[:split_pos] + name_cn[split_pos + 2:]
+                    if len(joined) >= 3 and split_pos < len(joined):
+                        self._no_comma.setdefault(joined, name_cn)
+        
+        # Fuzzy candidate lists (same order as base_name_mappings / chinese_names)
+        # with character-bigram postings and length buckets for candidate
+        # pre-filtering. Names are compared raw (processor=None) - no per-call
+        # normalization, and commas and taglines stay significant.
+        self._base_names = tuple(self.base_name_mappings)
+        self._base_bigrams = self._bigram_index(self._base_names)
+        self._base_by_length = self._length_index(self._base_names)
+        self._full_names = tuple(self.chinese_names)
+        self._full_bigrams = self._bigram_index(self._full_names)
+        self._full_by_length = self._length_index(self._full_names)
+    
+    @staticmethod
+    def _bigram_index(names: Sequence[str]) -> Dict[str, List[int]]:
+        """Character bigram -> ids (ascending) of the names containing it"""
+        index = {}
+        for i, name in enumerate(names):
+            for bigram in {name[j:j + 2] for j in range(len(name) - 1)}:
+                index.setdefault(bigram, []).append(i)
+        return index
+    
+    @staticmethod
+    def _length_index(names: Sequence[str]) -> Dict[int, List[int]]:
+        """Name length -> ids (ascending) of the names that long"""
+        index = {}
+        for i, name in enumerate(names):
+            index.setdefault(len(name), []).append(i)
+        return index
+    
+    @staticmethod
+    def _reachable_lengths(query_length: int, by_length: Dict[int, List[int]],
+                           threshold: int) -> Set[int]:
+        """
+        Name lengths that can reach `threshold` with fuzz.ratio against a
+        query this long - fuzz.ratio is at most 200 * min(len) / (sum of lengths)
+        """
+        q = query_length
+        return {n for n in by_length if 200 * min(q, n) >= threshold * (q + n)}
+    
+    @classmethod
+    def _fuzzy_candidates(cls, query: str, names: Sequence[str], index: Dict[str, List[int]],
+                          by_length: Dict[int, List[int]], threshold: int) -> Sequence[str]:
+        """
+        Names that can reach `threshold` with fuzz.ratio against `query`
+        
+        Candidates keep their original order so extractOne's tie-breaking
+        is unchanged.
+        """
+        return cls._batch_candidates((query,), names, index, by_length, threshold)
+    
+    @classmethod
+    def _batch_candidates(cls, queries: Sequence[str], names: Sequence[str],
+                          index: Dict[str, List[int]], by_length: Dict[int, List[int]],
+                          threshold: int) -> Sequence[str]:
+        """
+        Names any of `queries` can reach `threshold` with, for one cdist call
+        
+        Names whose length is too far from a query's are skipped (see
+        _reachable_lengths). Two different strings with no bigram in common
+        score at most 80 (2M / (3M - 1) for M common characters, M >= 2),
+        so above that threshold only names sharing a bigram with a query
+        are kept as well. A name ruled out for one query scores below the
+        cutoff against it anyway, so scoring every query against the union
+        (in the original order) picks the same first-best name as a
+        per-query extractOne.
+        """
+        grouped = defaultdict(list)  # Query length -> queries that long
+        for query in queries:
+            grouped[len(query)].append(query)
+        
+        ids = set()
+        for q, group in grouped.items():
+            lengths = cls._reachable_lengths(q, by_length, threshold)
+            if threshold > 80:
+                shared = set()
+                for query in group:
+                    for j in range(q - 1):
+                        shared.update(index.get(query[j:j + 2], ()))
+                ids.update(i for i in shared if len(names[i]) in lengths)
+            elif len(lengths) == len(by_length):
+                return names
+            else:
+                ids.update(i for n in lengths for i in by_length[n])
+        return [names[i] for i in sorted(ids)]
+    
     def match(self, chinese_name: str, threshold: int = 85) -> Optional[Dict]:
         """
         Match Chinese name to database with multiple strategies
@@ -59,128 +318,187 @@ class CardMatcher:
             threshold: Minimum similarity score for fuzzy matching (0-100)
             
         Returns:
-            Dict with English card data or None
+            Dict with English card data or None (cached - treat as read-only)
         """
-        # Strategy 1: Exact full name match
-        if chinese_name in self.mappings:
-            exact_matches = [self.mappings[chinese_name]] if not isinstance(self.mappings[chinese_name], list) else self.mappings[chinese_name]
-            
-            if isinstance(exact_matches, list):
-                exact_matches.sort(key=lambda x: x.get('card_number', 'ZZZ'))
-                best_match = exact_matches[0]
-            else:
-                best_match = exact_matches
-            
-            return {
-                **best_match,
-                'name_cn': chinese_name,
-                'match_score': 100,
-                'match_type': 'exact_full'
-            }
+        key = (chinese_name, threshold)
+        cached = self._match_cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
         
-        # Strategy 2: Base name match (without tagline)
-        # OCR might read "奇亚娜" when mapping has "奇亚娜, 所向披靡"
-        if chinese_name in self.base_name_mappings:
-            full_names = self.base_name_mappings[chinese_name]
-            # If multiple variants exist, pick the one with lowest card number
-            all_matches = []
-            for full_name in full_names:
-                matches = [self.mappings[full_name]] if not isinstance(self.mappings[full_name], list) else self.mappings[full_name]
-                all_matches.extend(matches)
-            
-            all_matches.sort(key=lambda x: x.get('card_number', 'ZZZ'))
-            best_match = all_matches[0]
-            
-            return {
-                **best_match,
-                'name_cn': chinese_name,
-                'matched_to': full_names[0],
-                'match_score': 100,
-                'match_type': 'base_name'
-            }
-        
-        # Strategy 3: Comma insertion for champion names read as one line
-        # e.g., "易锋芒毕现" -> "易, 锋芒毕现"
-        if len(chinese_name) >= 3:
-            for split_pos in [1, 2, 3]:
-                if split_pos < len(chinese_name):
-                    comma_variant = chinese_name[:split_pos] + ', ' + chinese_name[split_pos:]
-                    if comma_variant in self.mappings:
-                        exact_matches = [self.mappings[comma_variant]] if not isinstance(self.mappings[comma_variant], list) else self.mappings[comma_variant]
-                        
-                        if isinstance(exact_matches, list):
-                            exact_matches.sort(key=lambda x: x.get('card_number', 'ZZZ'))
-                            best_match = exact_matches[0]
-                        else:
-                            best_match = exact_matches
-                        
-                        return {
-                            **best_match,
-                            'name_cn': chinese_name,
-                            'matched_to': comma_variant,
-                            'match_score': 100,
-                            'match_type': 'comma_inserted'
-                        }
+        result = self._match_impl(chinese_name, threshold)
+        self._remember(key, result)
+        return result
+    
+    def _remember(self, key: tuple, result: Optional[Dict]):
+        """Store a match() result, evicting the oldest beyond MATCH_CACHE_SIZE"""
+        with self._match_cache_lock:
+            self._match_cache[key] = result
+            while len(self._match_cache) > MATCH_CACHE_SIZE:
+                del self._match_cache[next(iter(self._match_cache))]
+    
+    def _match_impl(self, chinese_name: str, threshold: int) -> Optional[Dict]:
+        """Uncached match(): strategies 1-5 in order"""
+        # Strategies 1-3: exact lookups
+        exact = self._match_exact(chinese_name)
+        if exact is not None:
+            return exact
         
         # Strategy 4: Fuzzy match on base names (more lenient for OCR errors)
         # Try to match against base names with high threshold
-        base_names_list = list(self.base_name_mappings.keys())
         result = process.extractOne(
             chinese_name,
-            base_names_list,
+            self._fuzzy_candidates(chinese_name, self._base_names, self._base_bigrams,
+                                  self._base_by_length, threshold),
             scorer=fuzz.ratio,
+            processor=None,
             score_cutoff=threshold
         )
         
         if result:
             matched_base_name, score, _ = result
-            full_names = self.base_name_mappings[matched_base_name]
-            
-            # Get card data for first variant
-            all_matches = []
-            for full_name in full_names:
-                matches = [self.mappings[full_name]] if not isinstance(self.mappings[full_name], list) else self.mappings[full_name]
-                all_matches.extend(matches)
-            
-            all_matches.sort(key=lambda x: x.get('card_number', 'ZZZ'))
-            best_match = all_matches[0]
-            
-            return {
-                **best_match,
-                'name_cn': chinese_name,
-                'matched_to': full_names[0],
-                'match_score': score,
-                'match_type': 'fuzzy_base_name'
-            }
+            return self._fuzzy_base_result(chinese_name, matched_base_name, score)
         
         # Strategy 5: Fuzzy match on full names (last resort)
         result = process.extractOne(
             chinese_name,
-            self.chinese_names,
+            self._fuzzy_candidates(chinese_name, self._full_names, self._full_bigrams,
+                                  self._full_by_length, threshold),
             scorer=fuzz.ratio,
+            processor=None,
             score_cutoff=threshold
         )
         
         if result:
             matched_name, score, _ = result
-            matches = [self.mappings[matched_name]] if not isinstance(self.mappings[matched_name], list) else self.mappings[matched_name]
-            
-            if isinstance(matches, list):
-                matches.sort(key=lambda x: x.get('card_number', 'ZZZ'))
-                best_match = matches[0]
-            else:
-                best_match = matches
+            return self._fuzzy_full_result(chinese_name, matched_name, score)
+        
+        return None
+    
+    def _match_exact(self, chinese_name: str) -> Optional[Dict]:
+        """Strategies 1-3 of match(): full name, base name, comma insertion"""
+        # Strategy 1: Exact full name match
+        variants = self.mappings.get(chinese_name)
+        if variants is not None:
+            return {
+                **variants[0]._asdict(),
+                'name_cn': chinese_name,
+                'match_score': 100,
+                'match_type': 'exact_full'
+            }
+        
+        # Strategy 2: Base name match (without tagline)
+        # OCR might read "奇亚娜" when mapping has "奇亚娜, 所向披靡"
+        # If multiple variants exist, the one with lowest card number (precomputed)
+        base_hit = self._base_best.get(chinese_name)
+        if base_hit is not None:
+            best_match, first_full_name = base_hit
             
             return {
-                **best_match,
+                **best_match._asdict(),
                 'name_cn': chinese_name,
-                'matched_to': matched_name,
-                'match_score': score,
-                'match_type': 'fuzzy_full'
+                'matched_to': first_full_name,
+                'match_score': 100,
+                'match_type': 'base_name'
+            }
+        
+        # Strategy 3: Comma insertion for champion names read as one line
+        # e.g., "易锋芒毕现" -> "易, 锋芒毕现" (precomputed)
+        comma_variant = self._no_comma.get(chinese_name)
+        if comma_variant is not None:
+            return {
+                **self.mappings[comma_variant][0]._asdict(),
+                'name_cn': chinese_name,
+                'matched_to': comma_variant,
+                'match_score': 100,
+                'match_type': 'comma_inserted'
             }
         
         return None
     
+    def _fuzzy_base_result(self, chinese_name: str, matched_base_name: str, score: float) -> Dict:
+        """Strategy 4 result for a fuzzy hit on a base name"""
+        best_match, first_full_name = self._base_best[matched_base_name]
+        
+        return {
+            **best_match._asdict(),
+            'name_cn': chinese_name,
+            'matched_to': first_full_name,
+            'match_score': score,
+            'match_type': 'fuzzy_base_name'
+        }
+    
+    def _fuzzy_full_result(self, chinese_name: str, matched_name: str, score: float) -> Dict:
+        """Strategy 5 result for a fuzzy hit on a full name"""
+        return {
+            **self.mappings[matched_name][0]._asdict(),
+            'name_cn': chinese_name,
+            'matched_to': matched_name,
+            'match_score': score,
+            'match_type': 'fuzzy_full'
+        }
+    
+    def match_many(self, chinese_names: Sequence[str], threshold: int = 85) -> Dict[str, Optional[Dict]]:
+        """
+        match() for many names at once
+        
+        Cached names and exact lookups are resolved per name; the names left
+        over are scored against the base names (then full names) that pass
+        the length / bigram pre-filter for any of them, in one process.cdist
+        call each, instead of one extractOne call per name.
+        
+        Returns:
+            Dict of each distinct name -> match() result
+        """
+        results = {}
+        misses = []
+        for name in dict.fromkeys(chinese_names):
+            key = (name, threshold)
+            cached = self._match_cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                results[name] = cached
+                continue
+            results[name] = self._match_exact(name)
+            if results[name] is None:
+                misses.append(name)
+            else:
+                self._remember(key, results[name])
+        
+        # Strategy 4, then 5 for what is still unmatched
+        for names, index, by_length, to_result in (
+            (self._base_names, self._base_bigrams, self._base_by_length, self._fuzzy_base_result),
+            (self._full_names, self._full_bigrams, self._full_by_length, self._fuzzy_full_result),
+        ):
+            if not misses:
+                break
+            candidates = self._batch_candidates(misses, names, index, by_length, threshold)
+            if not candidates:
+                continue
+            
+            scores = process.cdist(
+                misses, candidates,
+                scorer=fuzz.ratio,
+                processor=None,
+                score_cutoff=threshold,
+                dtype=np.float64,
+                workers=-1
+            )
+            best = scores.argmax(axis=1)  # first best, like extractOne
+            
+            still_missing = []
+            for name, row, col in zip(misses, scores, best):
+                score = row[col]
+                if score >= threshold:
+                    results[name] = to_result(name, candidates[col], float(score))
+                    self._remember((name, threshold), results[name])
+                else:
+                    still_missing.append(name)
+            misses = still_missing
+        
+        for name in misses:
+            self._remember((name, threshold), None)
+        
+        return results
+    
     def match_decklist(self, parsed_decklist: Dict) -> Dict:
         """
         Match all cards in a parsed decklist
@@ -212,10 +530,18 @@ class CardMatcher:
             if legend_match:
                 matched['metadata']['legend_name_en'] = legend_match['name_en']
         
-        # Match cards in each section
+        # Match every distinct card name in one batch
+        card_matches = self.match_many([
+            card['name_cn']
+            for cards in parsed_decklist['cards'].values()
+            for card in cards
+        ])
+        
+        # Match cards in each section, counting as we go
+        matched_cards = 0
         for section, cards in parsed_decklist['cards'].items():
             for card in cards:
-                match_result = self.match(card['name_cn'])
+                match_result = card_matches[card['name_cn']]
                 
                 if match_result:
                     # Image URL is already in match_result
@@ -233,6 +559,7 @@ class CardMatcher:
                         'ocr_confidence': card['confidence'],
                         'image_url_en': image_url_en
                     })
+                    matched_cards += 1
                 else:
                     matched['unmatched'].append({
                         'name_cn': card['name_cn'],
@@ -241,10 +568,8 @@ class CardMatcher:
                     })
         
         # Calculate stats
-        total_cards = sum(len(matched[section]) for section in ['legend', 'main_deck', 'battlefields', 'runes', 'side_deck'])
-        matched_cards = total_cards  # All cards in the sections are matched
         unmatched_count = len(matched['unmatched'])
-        total_with_unmatched = total_cards + unmatched_count
+        total_with_unmatched = matched_cards + unmatched_count
         
         matched['stats'] = {
             'total_cards': total_with_unmatched,
@@ -255,53 +580,56 @@ class CardMatcher:
         return matched
     
     def print_matched_decklist(self, matched: Dict):
-        """Pretty print matched decklist"""
-        print("\n" + "="*60)
-        print("MATCHED DECKLIST (Chinese → English)")
-        print("="*60)
+        """Pretty print matched decklist (one buffered write)"""
+        out = []
+        out.append("\n" + "="*60)
+        out.append("MATCHED DECKLIST (Chinese → English)")
+        out.append("="*60)
         
         meta = matched['metadata']
         if meta.get('player'):
-            print(f"Player: {meta['player']}")
+            out.append(f"Player: {meta['player']}")
         if meta.get('placement'):
-            print(f"Placement: {meta['placement']}")
+            out.append(f"Placement: {meta['placement']}")
         if meta.get('legend_name_en'):
-            print(f"Legend: {meta.get('legend_name')} → {meta['legend_name_en']}")
+            out.append(f"Legend: {meta.get('legend_name')} → {meta['legend_name_en']}")
         if meta.get('event'):
-            print(f"Event: {meta['event']}")
+            out.append(f"Event: {meta['event']}")
         if meta.get('date'):
-            print(f"Date: {meta['date']}")
+            out.append(f"Date: {meta['date']}")
         
         # Iterate through card sections (now at top level, not nested under 'cards')
         for section in ['legend', 'main_deck', 'battlefields', 'runes', 'side_deck']:
             cards = matched.get(section, [])
             if cards:
-                print(f"\n{section.upper().replace('_', ' ')}:")
-                print("-" * 60)
+                out.append(f"\n{section.upper().replace('_', ' ')}:")
+                out.append("-" * 60)
+                total = 0
                 for card in cards:
+                    total += card['quantity']
                     match_indicator = "✓" if card['match_score'] == 100 else "~"
-                    print(f"  {match_indicator} {card['quantity']}x {card['name_cn']} → {card['name_en']}")
+                    out.append(f"  {match_indicator} {card['quantity']}x {card['name_cn']} → {card['name_en']}")
                     if card['match_score'] < 100:
-                        print(f"      (fuzzy match: {card['match_score']:.0f}%)")
-                total = sum(c['quantity'] for c in cards)
-                print(f"  Total: {total} cards")
+                        out.append(f"      (fuzzy match: {card['match_score']:.0f}%)")
+                out.append(f"  Total: {total} cards")
         
         if matched.get('unmatched'):
-            print(f"\n⚠️  UNMATCHED CARDS:")
-            print("-" * 60)
+            out.append(f"\n⚠️  UNMATCHED CARDS:")
+            out.append("-" * 60)
             for card in matched['unmatched']:
-                print(f"  {card['quantity']}x {card['name_cn']} (section: {card['section']})")
+                out.append(f"  {card['quantity']}x {card['name_cn']} (section: {card['section']})")
         
         # Print stats if available
         if matched.get('stats'):
             stats = matched['stats']
-            print(f"\n📊 STATS:")
-            print("-" * 60)
-            print(f"  Total Cards: {stats['total_cards']}")
-            print(f"  Matched: {stats['matched_cards']}")
-            print(f"  Accuracy: {stats['accuracy']:.2f}%")
+            out.append(f"\n📊 STATS:")
+            out.append("-" * 60)
+            out.append(f"  Total Cards: {stats['total_cards']}")
+            out.append(f"  Matched: {stats['matched_cards']}")
+            out.append(f"  Accuracy: {stats['accuracy']:.2f}%")
         
-        print("\n" + "="*60)
+        out.append("\n" + "="*60)
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 
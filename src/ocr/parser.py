@@ -11,83 +11,312 @@ import easyocr
 import tempfile
 import sys
 import re
-from typing import List, Dict, Tuple, Optional
+import io
+from typing import List, Dict, Tuple, Optional, Union
 import os
 from collections import defaultdict
 import json
 import hashlib
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata as importlib_metadata
+
+from src.config import settings
+from src.ocr.buffers import mask_pool
 
 # Try to import pytesseract for numeric field fallback
 try:
     import pytesseract
-    TESSERACT_AVAILABLE = True
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+# Try to import tesserocr - keeps one Tesseract engine loaded in-process
+# instead of spawning the tesseract binary for every call
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
 except ImportError:
-    TESSERACT_AVAILABLE = False
-    print("[WARNING] pytesseract not installed - numeric field fallback disabled")
+    TESSEROCR_AVAILABLE = False
+
+TESSERACT_AVAILABLE = PYTESSERACT_AVAILABLE or TESSEROCR_AVAILABLE
+if not TESSERACT_AVAILABLE:
+    print("[WARNING] neither tesserocr nor pytesseract installed - numeric field fallback disabled")
+
+# Try to import numba for the JIT-compiled metadata boundary scan
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
+# PaddleOCR 3.x predict() takes a list of images in one call; 2.x only accepts
+# a list with detection disabled, so it gets one call per image
+try:
+    PADDLE_BATCH_OCR = int(importlib_metadata.version('paddleocr').split('.')[0]) >= 3
+except (importlib_metadata.PackageNotFoundError, ValueError):
+    PADDLE_BATCH_OCR = False
+
 # Initialize OCR (lazy loading to avoid blocking imports)
 _ocr = None
 _easy_reader = None
 _easy_reader_cn = None
+_tess_api = None
+_tess_lock = threading.Lock()  # A tesserocr API is not thread-safe
+
+# One lock per model - concurrent first calls (e.g. extract_metadata_batch
+# workers on a cold start) must build a model once, not once per thread
+_ocr_lock = threading.Lock()
+_easy_reader_lock = threading.Lock()
+_easy_reader_cn_lock = threading.Lock()
 
 def get_paddle_ocr():
     """Lazy load PaddleOCR"""
     global _ocr
     if _ocr is None:
-        print("[OCR] Initializing PaddleOCR... This may take 20-40 seconds on first run.")
-        try:
-            _ocr = PaddleOCR(
-                use_textline_orientation=True, 
-                lang='ch',
-                show_log=False  # Disable verbose logging
-            )
-            print("[OCR] PaddleOCR ready")
-        except Exception as e:
-            print(f"[OCR ERROR] Failed to initialize PaddleOCR: {e}")
-            raise RuntimeError(f"Failed to initialize PaddleOCR: {e}")
+        with _ocr_lock:
+            if _ocr is None:
+                print("[OCR] Initializing PaddleOCR... This may take 20-40 seconds on first run.")
+                try:
+                    _ocr = PaddleOCR(
+                        use_textline_orientation=True, 
+                        lang='ch',
+                        show_log=False  # Disable verbose logging
+                    )
+                    print("[OCR] PaddleOCR ready")
+                except Exception as e:
+                    print(f"[OCR ERROR] Failed to initialize PaddleOCR: {e}")
+                    raise RuntimeError(f"Failed to initialize PaddleOCR: {e}")
     return _ocr
 
 def get_easy_reader():
     """Lazy load EasyOCR English reader"""
     global _easy_reader
     if _easy_reader is None:
-        print("[OCR] Initializing EasyOCR (English)... This may take 20-30 seconds on first run.")
-        try:
-            _easy_reader = easyocr.Reader(['en'], gpu=False)
-            print("[OCR] EasyOCR English ready")
-        except Exception as e:
-            print(f"[OCR ERROR] Failed to initialize EasyOCR English: {e}")
-            raise RuntimeError(f"Failed to initialize EasyOCR English reader: {e}")
+        with _easy_reader_lock:
+            if _easy_reader is None:
+                print("[OCR] Initializing EasyOCR (English)... This may take 20-30 seconds on first run.")
+                try:
+                    _easy_reader = easyocr.Reader(['en'], gpu=False)
+                    print("[OCR] EasyOCR English ready")
+                except Exception as e:
+                    print(f"[OCR ERROR] Failed to initialize EasyOCR English: {e}")
+                    raise RuntimeError(f"Failed to initialize EasyOCR English reader: {e}")
     return _easy_reader
 
 def get_easy_reader_cn():
     """Lazy load EasyOCR Chinese reader"""
     global _easy_reader_cn
     if _easy_reader_cn is None:
-        print("[OCR] Initializing EasyOCR (Chinese)... This may take 30-60 seconds on first run.")
-        try:
-            _easy_reader_cn = easyocr.Reader(['ch_sim'], gpu=False)
-            print("[OCR] EasyOCR Chinese ready")
-        except Exception as e:
-            print(f"[OCR ERROR] Failed to initialize EasyOCR Chinese: {e}")
-            raise RuntimeError(f"Failed to initialize EasyOCR Chinese reader: {e}")
+        with _easy_reader_cn_lock:
+            if _easy_reader_cn is None:
+                print("[OCR] Initializing EasyOCR (Chinese)... This may take 30-60 seconds on first run.")
+                try:
+                    _easy_reader_cn = easyocr.Reader(['ch_sim'], gpu=False)
+                    print("[OCR] EasyOCR Chinese ready")
+                except Exception as e:
+                    print(f"[OCR ERROR] Failed to initialize EasyOCR Chinese: {e}")
+                    raise RuntimeError(f"Failed to initialize EasyOCR Chinese reader: {e}")
     return _easy_reader_cn
 
 
 # Removed - use get_easy_reader_cn() instead
 
 
+def get_tess_api():
+    """
+    Lazy load the shared tesserocr engine (call with _tess_lock held)
+    
+    Returns None if it can't be created (e.g. no tessdata) - callers then
+    fall back to pytesseract.
+    """
+    global _tess_api, TESSEROCR_AVAILABLE
+    if _tess_api is None and TESSEROCR_AVAILABLE:
+        try:
+            _tess_api = tesserocr.PyTessBaseAPI(oem=tesserocr.OEM.DEFAULT)
+        except Exception as e:
+            print(f"[OCR WARNING] tesserocr unavailable, using pytesseract: {e}")
+            TESSEROCR_AVAILABLE = False
+    return _tess_api
+
+
+def _tesseract_text(img: Image.Image, psm: int, digits_only: bool = True) -> str:
+    """Tesseract text for `img` in page segmentation mode `psm` (optionally digits only)"""
+    whitelist = '0123456789' if digits_only else ''
+    
+    with _tess_lock:
+        api = get_tess_api()
+        if api is not None:
+            api.SetPageSegMode(psm)
+            api.SetVariable('tessedit_char_whitelist', whitelist)
+            api.SetImage(img)
+            return api.GetUTF8Text().strip()
+    
+    if not PYTESSERACT_AVAILABLE:
+        return ''
+    config = f'--oem 3 --psm {psm}'
+    if whitelist:
+        # CRITICAL: tessedit_char_whitelist=0123456789
+        # This FORCES Tesseract to only output digits!
+        config += f' -c tessedit_char_whitelist={whitelist}'
+    return pytesseract.image_to_string(img, config=config).strip()
+
+
+def _png_bytes(img: Image.Image) -> bytes:
+    """
+    `img` encoded as PNG in memory
+    
+    EasyOCR decodes bytes exactly like an image file on disk (RGB plus a
+    grayscale copy), so this stands in for a temp file with identical input.
+    """
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def _rgb_array(img: Image.Image) -> np.ndarray:
+    """`img` as an RGB array (no extra convert() copy when it's already RGB)"""
+    return np.asarray(img if img.mode == 'RGB' else img.convert('RGB'))
+
+
+def _rgb_to_bgr(arr: np.ndarray) -> np.ndarray:
+    """Contiguous BGR copy of an RGB array (or view) for PaddleOCR"""
+    return np.ascontiguousarray(arr[:, :, ::-1])
+
+
+def _paddle_input(img: Image.Image) -> np.ndarray:
+    """
+    `img` as the BGR array PaddleOCR would get from cv2.imread on a saved PNG
+    
+    Lets OCR calls take the crop directly - no PNG encode/decode or temp file.
+    """
+    return _rgb_to_bgr(_rgb_array(img))
+
+
+def _paddle_ocr_batch(arrays: List[np.ndarray]) -> list:
+    """
+    PaddleOCR results for several BGR images, in order (same shape as .ocr())
+    
+    One batched predict() call on PaddleOCR 3.x, one .ocr() call per image
+    otherwise. An image whose OCR fails yields its exception instead.
+    """
+    ocr = get_paddle_ocr()
+    
+    if PADDLE_BATCH_OCR and len(arrays) > 1:
+        try:
+            return [[page] for page in ocr.predict(arrays)]
+        except Exception as e:
+            print(f"[OCR] Batched PaddleOCR call failed, retrying per image: {e}")
+    
+    results = []
+    for arr in arrays:
+        try:
+            results.append(ocr.ocr(arr))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
 SECTION_COLOR_BGR = (99, 78, 27)  # #1b4e63
 BACKGROUND_COLOR_BGR = (80, 57, 1)  # #013950
 
+# Patterns used per field / per OCR text, compiled once
+_DIGITS_RE = re.compile(r'\d+')
+_ALL_DIGITS_RE = re.compile(r'^\d+$')
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_QTY_ONLY_RE = re.compile(r'^[xX]?\d+$')
+_QTY_SUFFIX_RE = re.compile(r'\s*[xX]\d+\s*')
+_QTY_CHARS_ONLY_RE = re.compile(r'^[\d\sxX]+$')
+
 # Metadata extraction colors
 METADATA_BG_COLOR_HEX = '#1e3044'
 MAIN_DECK_BG_COLOR_HEX = '#013950'
 
 
+def _hex_to_rgb(hex_color):
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+# Parsed once at import
+_METADATA_RGB = np.array(_hex_to_rgb(METADATA_BG_COLOR_HEX), dtype=np.int64)
+_MAIN_RGB = np.array(_hex_to_rgb(MAIN_DECK_BG_COLOR_HEX), dtype=np.int64)
+
+# Max distance from the main deck color (30), squared - rows are compared
+# by squared distance, so no sqrt is needed
+_MAIN_THRESHOLD_SQ = 30 * 30
+
+# Boundary scan: average a strip of +/- 1% of the width around the sample
+# column (one noisy pixel can't break a run), and only look in the top half -
+# the metadata section normally ends at 15-30% of the screenshot
+BOUNDARY_STRIP_HALF_WIDTH_PERCENT = 1
+BOUNDARY_MAX_SCAN_PERCENT = 50
+
+
+def _scan_strip_numpy(strip, required):
+    """
+    First row of a run of `required` main-color rows in the strip, or -1
+    
+    Classifies every row at once, then finds the run with window sums.
+    A row's color is the mean over the strip's W columns; comparing row
+    sums against W * color, with the threshold scaled by W^2, is the same
+    test in exact integers, so this and _scan_strip_jit always agree.
+    """
+    n_cols = strip.shape[1]
+    row_sums = strip[:, :, :3].sum(axis=1, dtype=np.int64)
+    diff_main = row_sums - n_cols * _MAIN_RGB
+    diff_metadata = row_sums - n_cols * _METADATA_RGB
+    dist_to_main = np.einsum('ij,ij->i', diff_main, diff_main)
+    dist_to_metadata = np.einsum('ij,ij->i', diff_metadata, diff_metadata)
+    
+    # Is this row closer to main deck color? (threshold 30)
+    is_main = (dist_to_main < dist_to_metadata) & (dist_to_main < _MAIN_THRESHOLD_SQ * n_cols * n_cols)
+    
+    if is_main.size < required:
+        return -1
+    runs = np.convolve(is_main.astype(np.uint8), np.ones(required, dtype=np.uint8), 'valid')
+    hits = np.flatnonzero(runs == required)
+    return int(hits[0]) if hits.size else -1
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _scan_strip_jit(strip, main_rgb, metadata_rgb, threshold_sq, required):
+        """Row-by-row version of _scan_strip_numpy that stops at the first run"""
+        n_rows, n_cols = strip.shape[0], strip.shape[1]
+        limit = threshold_sq * n_cols * n_cols
+        consecutive = 0
+        for y in range(n_rows):
+            dist_to_main = 0
+            dist_to_metadata = 0
+            for c in range(3):
+                total = 0
+                for x in range(n_cols):
+                    total += strip[y, x, c]
+                d = total - n_cols * main_rgb[c]
+                dist_to_main += d * d
+                d = total - n_cols * metadata_rgb[c]
+                dist_to_metadata += d * d
+            if dist_to_main < dist_to_metadata and dist_to_main < limit:
+                consecutive += 1
+                if consecutive >= required:
+                    return y - required + 1
+            else:
+                consecutive = 0
+        return -1
+
+
+def _scan_strip(strip, required):
+    """Boundary row within the strip, or -1 (JIT scan when Numba is installed)"""
+    if NUMBA_AVAILABLE and strip.ndim == 3:
+        return _scan_strip_jit(strip, _MAIN_RGB, _METADATA_RGB, _MAIN_THRESHOLD_SQ, required)
+    return _scan_strip_numpy(strip, required)
+
+
 # ============================================================================
 # POSITION-BASED METADATA EXTRACTION (from other agent repo)
 # ============================================================================
@@ -99,51 +328,42 @@ def detect_metadata_boundary(img_pil, skip_top_percent=10, sample_x_percent=5):
     Args:
         img_pil: PIL Image object
         skip_top_percent: Skip top X% (to avoid status bar)
-        sample_x_percent: Sample at X% from left edge
+        sample_x_percent: Sample a strip centered X% from left edge
     
     Returns:
         boundary_y: Y coordinate where metadata section ends
     """
-    def hex_to_rgb(hex_color):
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-    
-    def color_distance(c1, c2):
-        """Euclidean distance between two RGB colors"""
-        return sum((int(a) - int(b)) ** 2 for a, b in zip(c1, c2)) ** 0.5
-    
-    img_array = np.array(img_pil)
-    height, width = img_array.shape[:2]
-    
-    metadata_rgb = hex_to_rgb(METADATA_BG_COLOR_HEX)
-    main_rgb = hex_to_rgb(MAIN_DECK_BG_COLOR_HEX)
+    width, height = img_pil.size
     
     skip_rows = int(height * (skip_top_percent / 100))
+    max_rows = int(height * (BOUNDARY_MAX_SCAN_PERCENT / 100))
     sample_x = int(width * (sample_x_percent / 100))
+    half_width = int(width * (BOUNDARY_STRIP_HALF_WIDTH_PERCENT / 100))
+    x0 = max(0, sample_x - half_width)
+    x1 = min(width, sample_x + half_width + 1)
     
-    main_color_consecutive = 0
-    required_consecutive = 5  # Need 5 consecutive main_color pixels to confirm
+    required_consecutive = 5  # Need 5 consecutive main_color rows to confirm
     
-    # Scan down the left edge
-    for y in range(skip_rows, height):
-        pixel = img_array[y, sample_x][:3]  # Get RGB
-        dist_to_main = color_distance(pixel, main_rgb)
-        dist_to_metadata = color_distance(pixel, metadata_rgb)
-        
-        # Is this pixel closer to main deck color?
-        if dist_to_main < dist_to_metadata and dist_to_main < 30:  # Threshold
-            main_color_consecutive += 1
-            if main_color_consecutive >= required_consecutive:
-                # Found boundary! Back up to first main_color pixel
-                return y - required_consecutive + 1
-        else:
-            main_color_consecutive = 0
+    # Only the strip is converted to an array, not the whole screenshot
+    # (a run starting just above the half-height limit can still be confirmed)
+    scan_end = min(height, max_rows + required_consecutive - 1)
+    strip = np.asarray(img_pil.crop((x0, skip_rows, x1, max(skip_rows, scan_end))))
+    
+    # First run of required_consecutive rows closer to the main deck color
+    hit = _scan_strip(strip, required_consecutive)
+    if hit >= 0:
+        # Found boundary! First main_color row of the run
+        return skip_rows + hit
     
     # Fallback to 20% if no clear boundary found
     return int(height * 0.20)
 
 
-def extract_metadata_field_tesseract(image_path, field_name):
+# Upscales tried for the Tesseract fallback, in order: (factor, resample filter)
+TESSERACT_UPSCALES = ((2, Image.BILINEAR), (4, Image.LANCZOS))
+
+
+def extract_metadata_field_tesseract(image: Union[str, Image.Image], field_name):
     """
     Fallback OCR for numeric fields using Tesseract with digit-only config
     
@@ -154,20 +374,19 @@ def extract_metadata_field_tesseract(image_path, field_name):
     - 10: Treat image as single character (BEST for single digit)
     - 13: Raw line (bypass all preprocessing)
     
+    Args:
+        image: Field crop, as a PIL Image or an image path
+    
     Returns extracted number or None
     """
     if not TESSERACT_AVAILABLE:
         return None
     
     try:
-        img = Image.open(image_path)
+        img = image if isinstance(image, Image.Image) else Image.open(image)
         
         # Preprocessing for better OCR
         img_gray = img.convert('L')  # Convert to grayscale
-        enlarged = img_gray.resize(
-            (img.width * 4, img.height * 4), 
-            Image.LANCZOS
-        )  # Upscale 4x for better recognition
         
         # Try multiple PSM modes with digits-only whitelist
         psm_modes = [
@@ -177,21 +396,24 @@ def extract_metadata_field_tesseract(image_path, field_name):
             (13, "raw line")           # Last resort
         ]
         
-        for psm, desc in psm_modes:
-            # CRITICAL: tessedit_char_whitelist=0123456789
-            # This FORCES Tesseract to only output digits!
-            custom_config = f'--oem 3 --psm {psm} -c tessedit_char_whitelist=0123456789'
-            result = pytesseract.image_to_string(enlarged, config=custom_config).strip()
+        # A cheap 2x bilinear upscale is usually enough; 4x Lanczos (16x the
+        # pixels) only as a second chance when no PSM mode read a number
+        for scale, resample in TESSERACT_UPSCALES:
+            enlarged = img_gray.resize((img.width * scale, img.height * scale), resample)
             
-            if result and result.isdigit():
-                return result
+            for psm, desc in psm_modes:
+                # Digits-only whitelist (shared tesserocr engine, or pytesseract)
+                result = _tesseract_text(enlarged, psm)
+                
+                if result and result.isdigit():
+                    return result
         
         # Fallback: Try without whitelist to see what Tesseract sees
-        result = pytesseract.image_to_string(enlarged, config='--oem 3 --psm 10').strip()
+        result = _tesseract_text(enlarged, 10, digits_only=False)
         
         # Extract any digits from result
         if result:
-            digits = re.findall(r'\d+', result)
+            digits = _DIGITS_RE.findall(result)
             if digits:
                 return digits[0]
         
@@ -201,32 +423,113 @@ def extract_metadata_field_tesseract(image_path, field_name):
         return None
 
 
-def extract_metadata_position_based(image_path: str, config_path='metadata_regions_config_new.json'):
+# Metadata fields read from the position config, in extraction order
+METADATA_FIELDS = ('player', 'deck_name', 'event', 'date', 'placement')
+_REGION_KEYS = ('x_percent', 'y_percent', 'width_percent', 'height_percent')
+
+
+# Bump when extraction changes, so cached metadata results are recomputed
+METADATA_CACHE_VERSION = 1
+
+
+def _metadata_cache_path(image: Union[str, Image.Image], regions) -> Optional[str]:
+    """
+    Cache file for this image content + region config, or None if disabled
+    
+    Paths are keyed by the file bytes, loaded images by their pixels.
+    """
+    if not settings.metadata_cache_dir:
+        return None
+    
+    digest = hashlib.blake2b(repr(regions).encode(), digest_size=16)
+    if isinstance(image, Image.Image):
+        digest.update(f"{image.mode}{image.size}".encode())
+        digest.update(image.tobytes())
+    else:
+        with open(image, 'rb') as f:
+            digest.update(f.read())
+    return os.path.join(settings.metadata_cache_dir,
+                        f"metadata_v{METADATA_CACHE_VERSION}_{digest.hexdigest()}.json")
+
+
+def _load_cached_metadata(cache_path: str) -> Optional[Dict]:
+    """Cached metadata result, or None if missing or unreadable"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_metadata(cache_path: str, result: Dict):
+    """Write a metadata result to cache_path atomically (best effort)"""
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError as e:
+        print(f"  [Metadata] Could not write cache {cache_path}: {e}")
+
+
+@functools.lru_cache(maxsize=4)
+def _load_metadata_regions(config_path: str) -> Tuple[Tuple[str, Tuple[float, float, float, float]], ...]:
+    """
+    Configured field regions as (field_name, (x, y, width, height) percents)
+    
+    Read and parsed once per config path. Raises FileNotFoundError (not
+    cached) when neither the path nor its project-root equivalent exists.
+    """
+    # Try config path relative to script
+    if not os.path.exists(config_path):
+        # Try relative to project root
+        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), config_path)
+    
+    with open(config_path, 'r', encoding='utf-8') as f:
+        regions = json.load(f).get('regions', {})
+    
+    return tuple(
+        (field_name, tuple(float(regions[field_name][key]) for key in _REGION_KEYS))
+        for field_name in METADATA_FIELDS
+        if field_name in regions
+    )
+
+
+def extract_metadata_position_based(image: Union[str, Image.Image], config_path='metadata_regions_config_new.json'):
     """
     Extract metadata using position-based regions with auto boundary detection
     
+    Args:
+        image: Image path or an already-loaded PIL Image
+    
     Returns dict with: player, deck_name, event, date, placement, legend_name
     """
-    # Load config
+    # Load config (cached)
     try:
-        # Try config path relative to script
-        if not os.path.exists(config_path):
-            # Try relative to project root
-            config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), config_path)
-        
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-    except FileNotFoundError:
-        print(f"  [Metadata] Config not found at {config_path}, using pattern-based fallback")
+        regions = _load_metadata_regions(config_path)
+    except FileNotFoundError as e:
+        print(f"  [Metadata] Config not found at {e.filename}, using pattern-based fallback")
         return None
     
-    # Load image
-    img = Image.open(image_path)
+    # Same image and config as a previous run? (disk cache, opt-in)
+    cache_path = _metadata_cache_path(image, regions)
+    if cache_path:
+        cached = _load_cached_metadata(cache_path)
+        if cached is not None:
+            return cached
+    
+    # Load image (unless the caller already decoded it)
+    img = image if isinstance(image, Image.Image) else Image.open(image)
     full_width, full_height = img.size
     
     # Auto-detect metadata boundary
     metadata_height = detect_metadata_boundary(img)
-    metadata_section = img.crop((0, 0, full_width, metadata_height))
     
     result = {
         'player': None,
@@ -237,19 +540,19 @@ def extract_metadata_position_based(image_path: str, config_path='metadata_regio
         'legend_name': None
     }
     
-    # Extract each field
-    for field_name in ['player', 'deck_name', 'event', 'date', 'placement']:
-        if field_name not in config.get('regions', {}):
-            continue
-        
-        region = config['regions'][field_name]
-        section_width, section_height = metadata_section.size
-        
+    # The metadata section is read straight into one RGB array; field crops
+    # are views into it, and only the (small) crops are copied for PaddleOCR
+    section_width, section_height = full_width, metadata_height
+    section_rgb = _rgb_array(img.crop((0, 0, section_width, section_height)))
+    
+    # Crop every configured field
+    fields = []
+    for field_name, (x_percent, y_percent, width_percent, height_percent) in regions:
         # Calculate crop using percentages
-        x = int(section_width * float(region['x_percent']) / 100)
-        y = int(section_height * float(region['y_percent']) / 100)
-        w = int(section_width * float(region['width_percent']) / 100)
-        h = int(section_height * float(region['height_percent']) / 100)
+        x = int(section_width * x_percent / 100)
+        y = int(section_height * y_percent / 100)
+        w = int(section_width * width_percent / 100)
+        h = int(section_height * height_percent / 100)
         
         # Bounds checking
         x = max(0, min(x, section_width))
@@ -258,13 +561,20 @@ def extract_metadata_position_based(image_path: str, config_path='metadata_regio
         h = max(1, min(h, section_height - y))
         
         # Crop the specific field region
-        crop = metadata_section.crop((x, y, x+w, y+h))
-        temp_path = f"temp_{field_name}_crop.png"
-        crop.save(temp_path)
-        
-        # Run PaddleOCR
+        fields.append((field_name, section_rgb[y:y+h, x:x+w]))
+    
+    # Run PaddleOCR on all field crops together (in memory - no temp files)
+    try:
+        ocr_results = _paddle_ocr_batch([_rgb_to_bgr(crop) for _, crop in fields])
+    except Exception as e:
+        ocr_results = [e] * len(fields)
+    
+    # Extract each field
+    for (field_name, crop), ocr_result in zip(fields, ocr_results):
         try:
-            ocr_result = get_paddle_ocr().ocr(temp_path)
+            if isinstance(ocr_result, Exception):
+                raise ocr_result
+            
             texts = []
             if ocr_result:
                 for page in ocr_result:
@@ -283,18 +593,18 @@ def extract_metadata_position_based(image_path: str, config_path='metadata_regio
                 # Field-specific processing and validation
                 if field_name == 'placement':
                     # MUST be a number
-                    match = re.search(r'\d+', combined_text)
+                    match = _DIGITS_RE.search(combined_text)
                     if match and match.group().isdigit():
                         result[field_name] = int(match.group())
                     else:
                         # Validation failed - try Tesseract
-                        fallback = extract_metadata_field_tesseract(temp_path, field_name)
+                        fallback = extract_metadata_field_tesseract(Image.fromarray(crop), field_name)
                         if fallback:
                             result[field_name] = int(fallback)
                 
                 elif field_name == 'date':
                     # MUST match YYYY-MM-DD format
-                    match = re.search(r'\d{4}-\d{2}-\d{2}', combined_text)
+                    match = _DATE_RE.search(combined_text)
                     if match:
                         result[field_name] = match.group()
                 
@@ -304,30 +614,45 @@ def extract_metadata_position_based(image_path: str, config_path='metadata_regio
             
             elif field_name == 'placement':
                 # No text from PaddleOCR - try Tesseract directly
-                fallback = extract_metadata_field_tesseract(temp_path, field_name)
+                fallback = extract_metadata_field_tesseract(Image.fromarray(crop), field_name)
                 if fallback:
                     result[field_name] = int(fallback)
         
         except Exception as e:
             print(f"  [Metadata] Error extracting {field_name}: {e}")
-        
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
+    
+    if cache_path:
+        _save_cached_metadata(cache_path, result)
     
     return result
 
+
+def extract_metadata_batch(images: List[Union[str, Image.Image]], workers: Optional[int] = None,
+                           config_path='metadata_regions_config_new.json') -> List[Optional[Dict]]:
+    """
+    Extract metadata from several images concurrently
+    
+    PaddleOCR inference releases the GIL, so the per-image calls overlap
+    on a thread pool. Results are in input order.
+    
+    Args:
+        images: Image paths or already-loaded PIL Images
+        workers: Thread count (defaults to settings.max_workers)
+    """
+    workers = workers or settings.max_workers
+    if workers <= 1 or len(images) <= 1:
+        return [extract_metadata_position_based(image, config_path) for image in images]
+    
+    with ThreadPoolExecutor(max_workers=min(workers, len(images)), thread_name_prefix="metadata") as pool:
+        return list(pool.map(lambda image: extract_metadata_position_based(image, config_path), images))
+
 # ============================================================================
 # END POSITION-BASED METADATA EXTRACTION
 # ============================================================================
 
-def detect_section_regions(image_path: str, tolerance=15):
-    """Stage 1: Detect large section regions by color"""
-    img = cv2.imread(image_path)
+def detect_section_regions(image: Union[str, np.ndarray], tolerance=15):
+    """Stage 1: Detect large section regions by color (image path or BGR array)"""
+    img = image if isinstance(image, np.ndarray) else cv2.imread(image)
     if img is None:
         return []
     
@@ -335,9 +660,12 @@ def detect_section_regions(image_path: str, tolerance=15):
     
     lower = np.array([max(0, c - tolerance) for c in SECTION_COLOR_BGR])
     upper = np.array([min(255, c + tolerance) for c in SECTION_COLOR_BGR])
-    mask = cv2.inRange(img, lower, upper)
-    
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    mask = mask_pool.acquire((height, width))
+    try:
+        cv2.inRange(img, lower, upper, dst=mask)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    finally:
+        mask_pool.release(mask)
     
     sections = []
     min_area = (width * height) * 0.05
@@ -355,31 +683,42 @@ def detect_section_regions(image_path: str, tolerance=15):
     sections.sort(key=lambda s: s['center_y'])
     return sections
 
-def detect_card_boxes_in_section(image_path: str, section_box: Tuple[int, int, int, int]):
+def detect_card_boxes_in_section(image: Union[str, np.ndarray], section_box: Tuple[int, int, int, int]):
     """
     Stage 2: Detect individual card boxes by finding background gaps
+    
+    Accepts an image path or an already-decoded BGR array.
     """
     x, y, w, h = section_box
     
-    img = cv2.imread(image_path)
+    img = image if isinstance(image, np.ndarray) else cv2.imread(image)
     section_img = img[y:y+h, x:x+w]
     
     # Detect BACKGROUND (gaps between cards)
     tolerance = 15
     bg_lower = np.array([max(0, c - tolerance) for c in BACKGROUND_COLOR_BGR])
     bg_upper = np.array([min(255, c + tolerance) for c in BACKGROUND_COLOR_BGR])
-    bg_mask = cv2.inRange(section_img, bg_lower, bg_upper)
-    
-    # Invert to get card regions
-    card_regions = cv2.bitwise_not(bg_mask)
     
-    # Clean up
-    kernel = np.ones((5,5), np.uint8)
-    card_regions = cv2.morphologyEx(card_regions, cv2.MORPH_CLOSE, kernel, iterations=2)
-    card_regions = cv2.morphologyEx(card_regions, cv2.MORPH_OPEN, kernel, iterations=1)
-    
-    # Find contours
-    contours, _ = cv2.findContours(card_regions, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # Two pooled scratch masks, ping-ponged through the steps below
+    mask_shape = section_img.shape[:2]
+    card_regions = mask_pool.acquire(mask_shape)
+    closed = mask_pool.acquire(mask_shape)
+    try:
+        cv2.inRange(section_img, bg_lower, bg_upper, dst=card_regions)
+        
+        # Invert to get card regions
+        cv2.bitwise_not(card_regions, dst=card_regions)
+        
+        # Clean up
+        kernel = np.ones((5,5), np.uint8)
+        cv2.morphologyEx(card_regions, cv2.MORPH_CLOSE, kernel, dst=closed, iterations=2)
+        cv2.morphologyEx(closed, cv2.MORPH_OPEN, kernel, dst=card_regions, iterations=1)
+        
+        # Find contours
+        contours, _ = cv2.findContours(card_regions, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    finally:
+        mask_pool.release(closed)
+        mask_pool.release(card_regions)
     
     # Filter for card-sized regions
     card_boxes = []
@@ -410,11 +749,11 @@ def detect_card_boxes_in_section(image_path: str, section_box: Tuple[int, int, i
     
     return card_boxes
 
-def ocr_card_box(image_path: str, box: Tuple[int, int, int, int]) -> Dict:
+def ocr_card_box(image: Union[str, Image.Image], box: Tuple[int, int, int, int]) -> Dict:
     """OCR a single card box with position-aware quantity detection"""
     x, y, w, h = box
 
-    img = Image.open(image_path)
+    img = image if isinstance(image, Image.Image) else Image.open(image)
     cropped = img.crop((x, y, x + w, y + h))
 
     # Extract name with fallback handling
@@ -426,27 +765,20 @@ def ocr_card_box(image_path: str, box: Tuple[int, int, int, int]) -> Dict:
     quantity_region = cropped.crop((split_point, 0, w, h))
 
     # Use EasyOCR - works perfectly without any preprocessing!
-    temp_qty = tempfile.NamedTemporaryFile(suffix='_qty.png', delete=False)
-    temp_qty_path = temp_qty.name
-    temp_qty.close()
-    quantity_region.save(temp_qty_path)
-
     # EasyOCR - reads x7, x5, etc. perfectly
-    qty_result = get_easy_reader().readtext(temp_qty_path, detail=0)
+    qty_result = get_easy_reader().readtext(_png_bytes(quantity_region), detail=0)
     qty_text = ' '.join(qty_result).strip() if qty_result else ''
 
-    os.remove(temp_qty_path)
-
     quantity = 1  # Default: empty = quantity 1
 
     # Parse quantity from EasyOCR output
     if qty_text:
-        if re.search(r'[xX]?\d+', qty_text):
-            qty_match = re.search(r'\d+', qty_text)
-            if qty_match:
-                qty_val = int(qty_match.group())
-                if 1 <= qty_val <= 12:
-                    quantity = qty_val
+        # First number in "x7" / "7"
+        qty_match = _DIGITS_RE.search(qty_text)
+        if qty_match:
+            qty_val = int(qty_match.group())
+            if 1 <= qty_val <= 12:
+                quantity = qty_val
 
     confidence = 0.0
 
@@ -479,10 +811,43 @@ def identify_section_type(section_index: int, section_area: float, all_areas: Li
     else:
         return 'side_deck'  # Fourth section or last
 
-def parse_with_two_stage(image_path: str):
+def load_image(image: Union[str, bytes, np.ndarray]) -> Tuple[np.ndarray, Image.Image]:
+    """
+    Decode an image once for both OpenCV and PIL stages
+    
+    OpenCV does the only decode; the PIL image wraps an RGB copy of the same
+    pixels instead of decoding the file a second time.
+    
+    Args:
+        image: File path, encoded image bytes (e.g. an upload body) or BGR array
+    
+    Returns:
+        (BGR array, PIL Image)
+    """
+    if isinstance(image, np.ndarray):
+        img_bgr = image
+    elif isinstance(image, (bytes, bytearray, memoryview)):
+        img_bgr = cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_COLOR)
+    else:
+        img_bgr = cv2.imread(image)
+    
+    if img_bgr is None:
+        raise ValueError("Could not decode image")
+    
+    img_pil = Image.fromarray(cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB))
+    return img_bgr, img_pil
+
+
+def parse_with_two_stage(image: Union[str, bytes, np.ndarray]):
     """
     Complete two-stage parsing
+    
+    Args:
+        image: File path, encoded image bytes or BGR array - decoded once and
+               shared by every stage, so in-memory uploads never touch disk
     """
+    img_bgr, full_image = load_image(image)
+    
     print("="*60)
     print("TWO-STAGE PARSER - FINAL VERSION")
     print("="*60)
@@ -506,7 +871,7 @@ def parse_with_two_stage(image_path: str):
     print("\n[Stage 0] Extracting metadata...")
     
     # Try position-based extraction first
-    metadata = extract_metadata_position_based(image_path)
+    metadata = extract_metadata_position_based(full_image)
     
     if metadata:
         # Position-based extraction successful
@@ -520,13 +885,10 @@ def parse_with_two_stage(image_path: str):
     else:
         # Fallback to pattern-based extraction
         print("  ⚠ Using pattern-based fallback")
-        img = Image.open(image_path)
-        width, height = img.size
-        
-        metadata_crop = img.crop((0, 0, width, int(height * 0.2)))
-        metadata_crop.save("temp_metadata.png")
+        width, height = full_image.size
         
-        metadata_result = get_paddle_ocr().ocr("temp_metadata.png")
+        metadata_crop = full_image.crop((0, 0, width, int(height * 0.2)))
+        metadata_result = get_paddle_ocr().ocr(_paddle_input(metadata_crop))
         
         if metadata_result:
             for page in metadata_result:
@@ -537,13 +899,13 @@ def parse_with_two_stage(image_path: str):
                     texts = page.get('rec_texts', [])
                 
                 for text in texts:
-                    if '排名' in text or (re.match(r'^\d+$', text) and len(text) <= 3):
-                        match = re.search(r'\d+', text)
+                    if '排名' in text or (_ALL_DIGITS_RE.match(text) and len(text) <= 3):
+                        match = _DIGITS_RE.search(text)
                         if match and not result.get('placement'):
                             result['placement'] = int(match.group())
                     
-                    elif re.search(r'\d{4}-\d{2}-\d{2}', text):
-                        result['date'] = re.search(r'\d{4}-\d{2}-\d{2}', text).group()
+                    elif date_match := _DATE_RE.search(text):
+                        result['date'] = date_match.group()
                     
                     elif '区域公开赛' in text or '赛区' in text:
                         result['event'] = text
@@ -559,10 +921,8 @@ def parse_with_two_stage(image_path: str):
     
     # Stage 1: Detect sections
     print("\n[Stage 1] Detecting section regions...")
-    sections = detect_section_regions(image_path)
+    sections = detect_section_regions(img_bgr)
     print(f"  Found {len(sections)} sections")
-    
-    full_image = Image.open(image_path)
 
     # Stage 1.5: Classify sections and detect duplicates
     print("\n[Stage 1.5] Classifying sections...")
@@ -599,14 +959,14 @@ def parse_with_two_stage(image_path: str):
 
         print(f"\n  Section {i} ({section_type}):")
 
-        card_boxes = detect_card_boxes_in_section(image_path, section['box'])
+        card_boxes = detect_card_boxes_in_section(img_bgr, section['box'])
         print(f"    Found {len(card_boxes)} card boxes")
         total_boxes += len(card_boxes)
 
         cards_in_section = []
 
         for j, card_box in enumerate(card_boxes, 1):
-            card_data = ocr_card_box(image_path, card_box)
+            card_data = ocr_card_box(full_image, card_box)
             if card_data['name_cn']:
                 # Set battlefields quantity to 1
                 if section_type == 'battlefields':
@@ -683,11 +1043,6 @@ def parse_with_two_stage(image_path: str):
             result['cards']['main_deck'].extend(cards)
 
     result['cards']['main_deck'] = deduplicate_cards(result['cards']['main_deck'])
-
-    # Cleanup (most temp files are now in system temp directory)
-    for temp_file in ["temp_metadata.png"]:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
     
     # Print results
     print("\n" + "="*60)
@@ -711,25 +1066,16 @@ def parse_with_two_stage(image_path: str):
     return result
 
 def _paddle_name_ocr(region: Image.Image):
-    temp_name_file = tempfile.NamedTemporaryFile(suffix='_name.png', delete=False)
-    temp_name_path = temp_name_file.name
-    temp_name_file.close()
-    region.save(temp_name_path)
-
-    try:
-        result = get_paddle_ocr().ocr(temp_name_path)
-        texts = []
-        if result:
-            for page in result:
-                if hasattr(page, 'rec_texts'):
-                    texts = page.rec_texts or []
-                elif isinstance(page, dict):
-                    texts = page.get('rec_texts', [])
-        card_name = _extract_card_name_from_texts(texts)
-        return card_name, texts
-    finally:
-        if os.path.exists(temp_name_path):
-            os.remove(temp_name_path)
+    result = get_paddle_ocr().ocr(_paddle_input(region))
+    texts = []
+    if result:
+        for page in result:
+            if hasattr(page, 'rec_texts'):
+                texts = page.rec_texts or []
+            elif isinstance(page, dict):
+                texts = page.get('rec_texts', [])
+    card_name = _extract_card_name_from_texts(texts)
+    return card_name, texts
 
 
 def _easyocr_cn(region: Image.Image):
@@ -746,10 +1092,10 @@ def _extract_card_name_from_texts(texts):
         cleaned = text.strip()
         if cleaned in ['传奇牌', '主牌组', '战场牌', '符文牌', '备牌']:
             continue
-        if re.match(r'^[xX]?\d+$', cleaned):
+        if _QTY_ONLY_RE.match(cleaned):
             continue
-        cleaned = re.sub(r'\s*[xX]\d+\s*', '', cleaned).strip()
-        if cleaned and not re.match(r'^[\d\sxX]+$', cleaned):
+        cleaned = _QTY_SUFFIX_RE.sub('', cleaned).strip()
+        if cleaned and not _QTY_CHARS_ONLY_RE.match(cleaned):
             accumulated += cleaned
             if len(accumulated) >= 2:
                 return accumulated
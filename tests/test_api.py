@@ -312,6 +312,97 @@ class TestDocumentation:
         assert "paths" in data
 
 
+
+class TestDecklistPayloadSchema:
+    """Test trusted decklists against the compiled schema validator"""
+    
+    def test_trusted_decklist_matches_schema(self):
+        """Test that a decklist built without validation still fits its schema"""
+        compiled = pytest.importorskip("src.models._compiled_validators")
+        from src.models.schemas import DecklistResponse
+        
+        matched = {
+            'decklist_id': 'abc123',
+            'metadata': {'placement': 1, 'event': 'Season 1 Finals', 'legend_name': '易'},
+            'legend': [{
+                'name_cn': '易, 锋芒毕现', 'name_en': 'Master Yi', 'card_number': '01IO060',
+                'type_en': 'Legend', 'quantity': 1, 'match_score': 100,
+                'match_type': 'exact_full', 'ocr_confidence': 0.98, 'image_url_en': ''
+            }],
+            'main_deck': [],
+            'stats': {'total_cards': 1, 'matched_cards': 1, 'accuracy': 100.0}
+        }
+        
+        decklist = DecklistResponse.build_trusted(matched)
+        
+        compiled.validate(decklist.model_dump(mode='json'))
+
+
+class TestOcrCache:
+    """Test the upload OCR cache shared by every endpoint"""
+    
+    def test_identical_uploads_are_parsed_once(self, monkeypatch):
+        """Test that sync and async OCR share one cache keyed by the upload bytes"""
+        import asyncio
+        from collections import OrderedDict
+        from src.api import routes
+        
+        calls = []
+        
+        def fake_parse(content):
+            calls.append(content)
+            return {'legend': [], 'main_deck': [], 'size': len(content)}
+        
+        monkeypatch.setattr(routes, 'parse_with_two_stage', fake_parse)
+        monkeypatch.setattr(routes, '_OCR_CACHE', OrderedDict())
+        
+        first = routes.parse_with_retry(b'upload-a')
+        again = asyncio.run(routes.run_ocr(b'upload-a'))
+        other = asyncio.run(routes.run_ocr(b'upload-b'))
+        
+        assert first == again
+        assert other['size'] == len(b'upload-b')
+        assert calls == [b'upload-a', b'upload-b']
+    
+    def test_key_is_128_bit_digest(self):
+        """Test that cache keys are full 128-bit digests, not 64-bit ints"""
+        from src.api import routes
+        
+        key = routes._content_hash(b'upload')
+        
+        assert isinstance(key, bytes) and len(key) == 16
+        assert key != routes._content_hash(b'upload2')
+
+
+class TestOcrRetry:
+    """Test which OCR failures parse_with_retry retries"""
+    
+    @pytest.mark.parametrize('error, attempts', [
+        (TimeoutError('stalled'), 3),
+        (MemoryError(), 3),
+        (RuntimeError('Failed to initialize PaddleOCR: no model'), 1),
+        (ValueError('bad image'), 1),
+    ])
+    def test_only_transient_errors_are_retried(self, monkeypatch, error, attempts):
+        """Test that timeouts/OOM are retried and model init or shape errors fail at once"""
+        from collections import OrderedDict
+        from src.api import routes
+        
+        calls = []
+        
+        def failing_parse(content):
+            calls.append(content)
+            raise error
+        
+        monkeypatch.setattr(routes, 'parse_with_two_stage', failing_parse)
+        monkeypatch.setattr(routes, '_OCR_CACHE', OrderedDict())
+        monkeypatch.setattr(routes, '_ocr_backoff', lambda attempt: 0)
+        
+        with pytest.raises(type(error)):
+            routes.parse_with_retry(b'upload')
+        
+        assert len(calls) == attempts
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
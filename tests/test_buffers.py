@@ -0,0 +1,49 @@
+"""
+Tests for the image scratch buffer pool
+"""
+
+import numpy as np
+
+from src.ocr.buffers import BufferPool
+
+
+class TestBufferPool:
+    """Test BufferPool reuse and sizing"""
+    
+    def test_acquire_shape_and_dtype(self):
+        """Acquired arrays have the requested shape and are C-contiguous"""
+        pool = BufferPool(maxsize=2)
+        arr = pool.acquire((30, 40))
+        
+        assert arr.shape == (30, 40)
+        assert arr.dtype == np.uint8
+        assert arr.flags['C_CONTIGUOUS']
+    
+    def test_released_buffer_is_reused(self):
+        """A released buffer backs the next acquire of the same or smaller size"""
+        pool = BufferPool(maxsize=2)
+        arr = pool.acquire((30, 40))
+        pool.release(arr)
+        
+        again = pool.acquire((20, 40))
+        assert np.shares_memory(arr, again)
+    
+    def test_too_small_buffer_is_replaced(self):
+        """A larger request allocates instead of reusing a small buffer"""
+        pool = BufferPool(maxsize=2)
+        small = pool.acquire((10, 10))
+        pool.release(small)
+        
+        big = pool.acquire((100, 100))
+        assert big.shape == (100, 100)
+        assert not np.shares_memory(small, big)
+    
+    def test_release_when_full_is_dropped(self):
+        """Releasing into a full pool does not raise"""
+        pool = BufferPool(maxsize=1)
+        a = pool.acquire((5, 5))
+        b = pool.acquire((5, 5))
+        pool.release(a)
+        pool.release(b)
+        
+        assert pool._buffers.qsize() == 1
@@ -0,0 +1,117 @@
+"""
+Tests for the standalone metadata boundary detector (detect_metadata_boundary.py)
+Uses synthetic screenshots painted in the metadata / main deck colors
+"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import detect_metadata_boundary as dmb
+
+
+METADATA_RGB = dmb.hex_to_rgb(dmb.METADATA_BG_COLOR_HEX)
+MAIN_RGB = dmb.hex_to_rgb(dmb.MAIN_DECK_BG_COLOR_HEX)
+
+
+def make_screenshot(height=1000, width=200, boundary=300, bands=()):
+    """Metadata color above `boundary`, main deck color below, plus main-color (start, stop) bands"""
+    img = np.empty((height, width, 3), dtype=np.uint8)
+    img[:] = METADATA_RGB
+    if boundary is not None:
+        img[boundary:] = MAIN_RGB
+    for start, stop in bands:
+        img[start:stop] = MAIN_RGB
+    return Image.fromarray(img)
+
+
+class TestDetectMetadataBoundary:
+    """Test detect_metadata_boundary's return contract"""
+
+    def test_numpy_path_returns_first_run(self, monkeypatch):
+        """A main-color band above the real boundary is the first run, as in the other paths"""
+        monkeypatch.setattr(dmb, "NUMBA_AVAILABLE", False)
+        img = make_screenshot(height=1000, boundary=300, bands=[(120, 130)])
+
+        assert dmb.detect_metadata_boundary(img) == 120
+        assert dmb.detect_metadata_boundary(img, use_numpy=False) == 120
+
+
+# Heights on both sides of DOWNSCALE_MIN_HEIGHT, boundaries inside the scan
+BATCH_CASES = [
+    dict(height=800, boundary=160),
+    dict(height=1200, boundary=301),
+    dict(height=1200, boundary=None),  # No boundary - 20% fallback
+    dict(height=2400, boundary=483),
+    dict(height=3000, boundary=722, bands=[(400, 410)]),
+]
+
+
+class TestDetectMetadataBoundaries:
+    """Test the batch entry point against per-image detection"""
+
+    @pytest.fixture
+    def image_paths(self, temp_dir):
+        paths = []
+        for i, case in enumerate(BATCH_CASES):
+            path = os.path.join(temp_dir, f"screenshot_{i}.png")
+            make_screenshot(**case).save(path)
+            paths.append(path)
+        return paths
+
+    @pytest.mark.parametrize("use_numba", [
+        False,
+        pytest.param(True, marks=pytest.mark.skipif(not dmb.NUMBA_AVAILABLE, reason="numba not installed")),
+    ])
+    def test_matches_single_image_detection(self, image_paths, monkeypatch, use_numba):
+        """Batch results equal detect_metadata_boundary per image, in order"""
+        monkeypatch.setattr(dmb, "NUMBA_AVAILABLE", use_numba)
+        expected = []
+        for path in image_paths:
+            with Image.open(path) as img:
+                expected.append(dmb.detect_metadata_boundary(img))
+
+        assert dmb.detect_metadata_boundaries(image_paths) == expected
+
+
+# (make_screenshot kwargs, expected boundary_y) - short images go through the
+# bisection, tall ones (> DOWNSCALE_MIN_HEIGHT) through the 1/4-scale pass + refine
+PATH_CASES = [
+    (dict(height=1000, boundary=300), 300),
+    (dict(height=1000, boundary=300, bands=[(120, 130)]), 120),
+    (dict(height=1000, boundary=None), 200),  # 20% fallback
+    (dict(height=2400, boundary=483), 483),
+    (dict(height=2400, boundary=800, bands=[(500, 540)]), 500),
+    (dict(height=2400, boundary=None), 480),
+]
+
+# How each scan implementation is selected
+SCAN_PATHS = {
+    "numpy": dict(numba=False, use_numpy=True),
+    "numpy-no-bisect": dict(numba=False, use_numpy=True, probes=()),
+    "numba": dict(numba=True, use_numpy=True),
+    "pil": dict(numba=False, use_numpy=False),
+}
+
+
+class TestScanPaths:
+    """Every scan implementation returns the same row"""
+
+    @pytest.mark.parametrize("path", [
+        pytest.param(name, marks=pytest.mark.skipif(
+            config["numba"] and not dmb.NUMBA_AVAILABLE, reason="numba not installed"))
+        for name, config in SCAN_PATHS.items()
+    ])
+    @pytest.mark.parametrize("case, expected", PATH_CASES)
+    def test_paths_agree(self, monkeypatch, path, case, expected):
+        """Each path finds the first run (exact row after refining) or falls back to 20%"""
+        config = SCAN_PATHS[path]
+        monkeypatch.setattr(dmb, "NUMBA_AVAILABLE", config["numba"])
+        if "probes" in config:
+            monkeypatch.setattr(dmb, "BISECT_PROBE_PERCENTS", config["probes"])
+
+        img = make_screenshot(**case)
+
+        assert dmb.detect_metadata_boundary(img, use_numpy=config["use_numpy"]) == expected
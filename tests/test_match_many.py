@@ -0,0 +1,42 @@
+"""
+Tests for CardMatcher.match_many (batched fuzzy matching)
+"""
+
+import pytest
+
+from src.ocr.matcher import CardMatcher
+
+
+# Exact, fuzzy base-name, fuzzy full-name, and unmatched readings
+QUERIES = [
+    '易锋芒毕现',
+    '快斗架势',
+    '小小守护',
+    '疾风剑豪豪',
+    '奇亚娜, 元素女',
+    '无极剑',
+    '不存在的卡',
+    '卡',
+]
+
+
+class TestMatchMany:
+    """Test that match_many agrees with match() per name"""
+
+    @pytest.mark.parametrize('threshold', [50, 75, 80, 85, 95])
+    def test_same_results_as_match(self, sample_card_mapping_csv, threshold):
+        """Pre-filtered batch scoring picks the same card and score as match()"""
+        expected = CardMatcher(sample_card_mapping_csv)
+
+        results = CardMatcher(sample_card_mapping_csv).match_many(QUERIES, threshold=threshold)
+
+        assert results == {name: expected.match(name, threshold=threshold) for name in QUERIES}
+
+    def test_length_bound_prunes_candidates(self, sample_card_mapping_csv):
+        """Below the bigram cutoff, names too long or short to reach the threshold are skipped"""
+        matcher = CardMatcher(sample_card_mapping_csv)
+
+        candidates = matcher._batch_candidates(['小小守'], matcher._full_names, matcher._full_bigrams,
+                                               matcher._full_by_length, threshold=75)
+
+        assert candidates == [name for name in matcher._full_names if 3 <= len(name) <= 5]
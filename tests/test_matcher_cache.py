@@ -0,0 +1,91 @@
+"""
+Tests for the card matcher's caches
+Memoized match() results and the on-disk index cache
+"""
+
+import os
+import pickle
+
+import pytest
+
+import src.ocr.matcher as matcher_module
+from src.ocr.matcher import CardMatcher
+
+
+class TestMatchCache:
+    """Test memoization of match() results"""
+
+    def test_repeat_match_is_cached(self, sample_card_mapping_csv):
+        """Test that a repeated query returns the cached result"""
+        matcher = CardMatcher(sample_card_mapping_csv)
+
+        first = matcher.match('易锋芒毕现')
+
+        assert matcher.match('易锋芒毕现') is first
+
+    def test_threshold_is_part_of_key(self, sample_card_mapping_csv):
+        """Test that a miss at one threshold doesn't hide a lower-threshold match"""
+        matcher = CardMatcher(sample_card_mapping_csv)
+
+        assert matcher.match('快斗架势', threshold=99) is None
+        assert matcher.match('快斗架势', threshold=75) is not None
+
+    def test_eviction_between_check_and_read(self, sample_card_mapping_csv):
+        """Test that a key evicted by another thread mid-lookup isn't read as a cached miss"""
+        class EvictingCache(dict):
+            """Drops the key on a membership test, as a concurrent _remember would"""
+            def __contains__(self, key):
+                self.pop(key, None)
+                return True
+
+        matcher = CardMatcher(sample_card_mapping_csv)
+        expected = matcher.match('小小守护者')
+        matcher._match_cache = EvictingCache(matcher._match_cache)
+
+        assert expected is not None
+        assert matcher.match('小小守护者') == expected
+        assert matcher.match_many(['小小守护者'])['小小守护者'] == expected
+
+
+class TestIndexCache:
+    """Test the pickled index cache in cache_dir"""
+
+    def test_round_trip(self, sample_card_mapping_csv, temp_dir):
+        """Test that a second load restores the same indexes from the cache"""
+        cache_dir = os.path.join(temp_dir, 'matcher-cache')
+        built = CardMatcher(sample_card_mapping_csv, cache_dir=cache_dir)
+        cached = CardMatcher(sample_card_mapping_csv, cache_dir=cache_dir)
+
+        assert len(os.listdir(cache_dir)) == 1
+        assert cached.mappings == built.mappings
+        assert cached.match('易锋芒毕现') == built.match('易锋芒毕现')
+
+    @pytest.mark.parametrize('contents', [
+        b'not a pickle',
+        pickle.dumps({'mappings': {}}),  # Older layout - indexes missing
+    ])
+    def test_unreadable_cache_is_rebuilt(self, sample_card_mapping_csv, temp_dir, contents):
+        """Test that a corrupt or stale cache file is ignored and overwritten"""
+        cache_dir = os.path.join(temp_dir, 'matcher-cache')
+        expected = CardMatcher(sample_card_mapping_csv)
+        cache_path = CardMatcher._index_cache_path(sample_card_mapping_csv, cache_dir)
+        os.makedirs(cache_dir)
+        with open(cache_path, 'wb') as f:
+            f.write(contents)
+
+        matcher = CardMatcher(sample_card_mapping_csv, cache_dir=cache_dir)
+
+        assert matcher.mappings == expected.mappings
+        assert matcher.match('易锋芒毕现') == expected.match('易锋芒毕现')
+        with open(cache_path, 'rb') as f:
+            assert pickle.load(f)['mappings'] == expected.mappings
+
+    def test_version_bump_ignores_old_cache(self, sample_card_mapping_csv, temp_dir, monkeypatch):
+        """Test that an INDEX_CACHE_VERSION change writes a fresh cache file"""
+        cache_dir = os.path.join(temp_dir, 'matcher-cache')
+        CardMatcher(sample_card_mapping_csv, cache_dir=cache_dir)
+        monkeypatch.setattr(matcher_module, 'INDEX_CACHE_VERSION', matcher_module.INDEX_CACHE_VERSION + 1)
+
+        CardMatcher(sample_card_mapping_csv, cache_dir=cache_dir)
+
+        assert len(os.listdir(cache_dir)) == 2
@@ -0,0 +1,87 @@
+"""
+Tests for position-based metadata extraction helpers in src/ocr/parser.py
+OCR engines are monkeypatched - no models are loaded
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.ocr import parser
+
+
+class TestExtractMetadataBatch:
+    """Test thread-pooled metadata extraction"""
+
+    def test_results_in_input_order(self, monkeypatch):
+        """Results follow the input order even when later images finish first"""
+        def fake_extract(image, config_path):
+            time.sleep(0.01 * (5 - image))
+            return {'player': f"player-{image}"}
+
+        monkeypatch.setattr(parser, 'extract_metadata_position_based', fake_extract)
+
+        results = parser.extract_metadata_batch([0, 1, 2, 3, 4], workers=4)
+
+        assert results == [{'player': f"player-{i}"} for i in range(5)]
+
+    def test_single_worker_runs_inline(self, monkeypatch):
+        """workers=1 extracts on the calling thread"""
+        threads = []
+
+        def fake_extract(image, config_path):
+            threads.append(threading.current_thread())
+            return {}
+
+        monkeypatch.setattr(parser, 'extract_metadata_position_based', fake_extract)
+
+        parser.extract_metadata_batch(['a.png', 'b.png'], workers=1)
+
+        assert threads == [threading.current_thread()] * 2
+
+
+class TestLazyModelInit:
+    """Test that lazily loaded OCR models are built once"""
+
+    def test_concurrent_first_calls_build_one_paddle_ocr(self, monkeypatch):
+        """Threads racing on a cold start share a single PaddleOCR instance"""
+        built = []
+
+        class SlowPaddleOCR:
+            def __init__(self, **kwargs):
+                time.sleep(0.05)
+                built.append(self)
+
+        monkeypatch.setattr(parser, 'PaddleOCR', SlowPaddleOCR)
+        monkeypatch.setattr(parser, '_ocr', None)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            instances = list(pool.map(lambda _: parser.get_paddle_ocr(), range(8)))
+
+        assert len(built) == 1
+        assert all(instance is built[0] for instance in instances)
+
+
+class TestBoundaryScan:
+    """Test the metadata boundary strip scans"""
+
+    @pytest.mark.skipif(not parser.NUMBA_AVAILABLE, reason="numba not installed")
+    def test_numpy_and_jit_scans_agree(self):
+        """_scan_strip_numpy and _scan_strip_jit return the same row on noisy strips"""
+        rng = np.random.default_rng(0)
+        metadata_rgb = parser._METADATA_RGB.astype(np.int16)
+        main_rgb = parser._MAIN_RGB.astype(np.int16)
+
+        for _ in range(500):
+            height, width = rng.integers(0, 80), rng.integers(1, 30)
+            strip = np.empty((height, width, 3), dtype=np.int16)
+            strip[:] = metadata_rgb
+            strip[rng.integers(0, height + 1):] = main_rgb
+            strip = (strip + rng.integers(-40, 40, strip.shape)).clip(0, 255).astype(np.uint8)
+
+            jit = parser._scan_strip_jit(strip, parser._MAIN_RGB, parser._METADATA_RGB,
+                                         parser._MAIN_THRESHOLD_SQ, 5)
+            assert jit == parser._scan_strip_numpy(strip, 5)
@@ -0,0 +1,275 @@
+"""
+Tests for the main Riftbound API client
+Uses httpx.MockTransport in place of the real main API
+"""
+
+import asyncio
+
+import httpx
+
+from src.clients.riftbound_api import RiftboundAPIClient
+
+
+BASE_URL = "http://main-api.test/api"
+
+CARDS_BY_NUMBER = {
+    "01IO060": {"id": 1, "name": "Master Yi, The Wuju Bladesman"},
+    "01IO001": {"id": 2, "name": "Tiny Protector"},
+}
+CARDS_BY_NAME = {
+    "Dueling Stance": {"id": 3, "name": "Dueling Stance"},
+}
+
+
+def make_client(handler) -> RiftboundAPIClient:
+    """Client whose async requests are answered by `handler`"""
+    client = RiftboundAPIClient(base_url=BASE_URL)
+    client.client = httpx.AsyncClient(
+        base_url=BASE_URL,
+        transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def card_handler(request: httpx.Request) -> httpx.Response:
+    """Fake /cards and /cards/search endpoints"""
+    if request.url.path.endswith("/cards/search"):
+        card = CARDS_BY_NAME.get(request.url.params.get("q"))
+    else:
+        card = CARDS_BY_NUMBER.get(request.url.params.get("card_number"))
+    return httpx.Response(200, json=[card] if card else [])
+
+
+class TestResolveCardIds:
+    """Test concurrent card ID resolution"""
+
+    def test_resolves_by_number_then_name(self):
+        """Card number lookup is tried first, name lookup is the fallback"""
+        client = make_client(card_handler)
+        cards = [
+            {"card_number": "01IO060", "name_en": "Master Yi", "quantity": 1, "section": "legend"},
+            {"card_number": "99XX999", "name_en": "Dueling Stance", "quantity": 3, "section": "main_deck"},
+            {"card_number": "01IO001", "name_en": "Tiny Protector", "quantity": 2, "section": "main_deck"},
+        ]
+
+        resolved = asyncio.run(client.resolve_card_ids(cards))
+
+        assert resolved == [
+            {"card_id": 1, "quantity": 1, "section": "legend"},
+            {"card_id": 3, "quantity": 3, "section": "main_deck"},
+            {"card_id": 2, "quantity": 2, "section": "main_deck"},
+        ]
+
+    def test_unresolved_cards_are_dropped(self):
+        """Cards missing from the main API are left out of the result"""
+        client = make_client(card_handler)
+        cards = [
+            {"card_number": "00XX000", "name_en": "Nope", "quantity": 1, "section": "main_deck"},
+            {"card_number": "01IO001", "name_en": "Tiny Protector", "quantity": 2, "section": "main_deck"},
+        ]
+
+        resolved = asyncio.run(client.resolve_card_ids(cards))
+
+        assert resolved == [{"card_id": 2, "quantity": 2, "section": "main_deck"}]
+
+    def test_http_errors_are_treated_as_not_found(self):
+        """A failing main API doesn't raise out of resolve_card_ids"""
+        client = make_client(lambda request: httpx.Response(500))
+        cards = [{"card_number": "01IO060", "name_en": "Master Yi", "quantity": 1, "section": "legend"}]
+
+        assert asyncio.run(client.resolve_card_ids(cards)) == []
+
+
+class TestResolveCardIdsBatch:
+    """Test batch card ID resolution and its per-card fallback"""
+
+    CARDS = [
+        {"card_number": "01IO060", "name_en": "Master Yi", "quantity": 1, "section": "legend"},
+        {"card_number": "99XX999", "name_en": "Dueling Stance", "quantity": 3, "section": "main_deck"},
+    ]
+
+    def test_batch_endpoint_used_in_one_request(self):
+        """All cards are resolved by a single POST /cards/lookup"""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=[{"id": 1}, {"id": 3}])
+
+        client = make_client(handler)
+        resolved = asyncio.run(client.resolve_card_ids_batch(self.CARDS))
+
+        assert [card["card_id"] for card in resolved] == [1, 3]
+        assert len(requests) == 1
+        assert requests[0].method == "POST"
+
+    def test_batch_misses_fall_back_to_per_card(self):
+        """Entries the batch call returns as null are looked up individually"""
+        def handler(request):
+            if request.url.path.endswith("/cards/lookup"):
+                return httpx.Response(200, json=[{"id": 1}, None])
+            return card_handler(request)
+
+        client = make_client(handler)
+        resolved = asyncio.run(client.resolve_card_ids_batch(self.CARDS))
+
+        assert [card["card_id"] for card in resolved] == [1, 3]
+
+    def test_missing_batch_endpoint_is_remembered(self):
+        """A 404 from /cards/lookup switches the client to per-card lookups"""
+        batch_calls = []
+
+        def handler(request):
+            if request.url.path.endswith("/cards/lookup"):
+                batch_calls.append(request)
+                return httpx.Response(404)
+            return card_handler(request)
+
+        client = make_client(handler)
+        first = asyncio.run(client.resolve_card_ids_batch(self.CARDS))
+        second = asyncio.run(client.resolve_card_ids_batch(self.CARDS))
+
+        assert first == second
+        assert [card["card_id"] for card in first] == [1, 3]
+        assert len(batch_calls) == 1
+
+
+class TestCardLookupCache:
+    """Test caching of card lookups"""
+
+    def test_repeat_lookups_hit_the_cache(self):
+        """A found card is fetched once, then served from the cache"""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return card_handler(request)
+
+        client = make_client(handler)
+        cards = [{"card_number": "01IO060", "name_en": "Master Yi", "quantity": 1, "section": "legend"}]
+
+        first = asyncio.run(client.resolve_card_ids(cards))
+        second = asyncio.run(client.resolve_card_ids(cards))
+
+        assert first == second == [{"card_id": 1, "quantity": 1, "section": "legend"}]
+        assert len(requests) == 1
+        assert client.card_cache.stats()["hits"] == 1
+
+    def test_not_found_is_not_cached(self):
+        """Misses are retried against the API on the next lookup"""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return card_handler(request)
+
+        client = make_client(handler)
+        asyncio.run(client.get_card_by_number("00XX000"))
+        asyncio.run(client.get_card_by_number("00XX000"))
+
+        assert len(requests) == 2
+
+    def test_keys_are_normalized(self):
+        """Lookups differing only in case/whitespace share an entry"""
+        client = make_client(card_handler)
+        asyncio.run(client.get_card_by_name("Dueling Stance"))
+
+        assert client.card_cache.get(client.card_cache.key("name", "  dueling stance ")) is not None
+
+
+class TestFormatLookup:
+    """Test the cached format-by-name lookup"""
+
+    FORMATS = [{"id": 1, "name": "Origins"}, {"id": 2, "name": "Spiritforged"}]
+
+    def test_formats_fetched_once(self):
+        """Repeated lookups reuse one /formats response"""
+        client = RiftboundAPIClient(base_url=BASE_URL)
+        calls = []
+
+        async def get_formats():
+            calls.append(1)
+            return self.FORMATS
+
+        client.get_formats = get_formats
+
+        assert asyncio.run(client.get_format_by_name("origins"))["id"] == 1
+        assert asyncio.run(client.get_format_by_name("SPIRITFORGED"))["id"] == 2
+        assert asyncio.run(client.get_format_by_name("Unknown")) is None
+        assert len(calls) == 1
+
+    def test_failed_fetch_is_not_cached(self):
+        """An empty /formats result is retried on the next lookup"""
+        client = RiftboundAPIClient(base_url=BASE_URL)
+        responses = [[], self.FORMATS]
+
+        async def get_formats():
+            return responses.pop(0)
+
+        client.get_formats = get_formats
+
+        assert asyncio.run(client.get_format_by_name("Origins")) is None
+        assert asyncio.run(client.get_format_by_name("Origins"))["id"] == 1
+
+
+class TestMapOcrToDeckSchema:
+    """Test mapping matcher output to the main API deck schema"""
+
+    OCR_RESULT = {
+        "metadata": {"placement": 1, "event": "Shanghai Open"},
+        "legend": [{"name_cn": "易", "name_en": "Master Yi, The Wuju Bladesman", "card_number": "01IO060", "quantity": 1}],
+        "main_deck": [
+            {"name_cn": "小小守护者", "name_en": "Tiny Protector", "card_number": "01IO001", "quantity": 3},
+            {"name_cn": "???", "name_en": "UNKNOWN", "card_number": None, "quantity": 2},
+        ],
+        "runes": [{"name_cn": "符文", "name_en": "Calm Rune", "card_number": "01RU001"}],
+        "stats": {"accuracy": 75.0},
+    }
+
+    def test_cards_size_and_name(self):
+        """Unmatched cards are skipped and the size sums the kept quantities"""
+        client = RiftboundAPIClient(base_url=BASE_URL)
+        deck = client.map_ocr_to_deck_schema(self.OCR_RESULT, owner="p1")
+
+        assert deck["name"] == "Master Yi - #1 Shanghai Open"
+        assert deck["legend"] == "Master Yi"
+        assert [(c["card_number"], c["quantity"], c["section"]) for c in deck["cards"]] == [
+            ("01IO060", 1, "legend"),
+            ("01IO001", 3, "main_deck"),
+            ("01RU001", 1, "runes"),
+        ]
+        assert deck["size"] == 5
+
+
+class TestHealthCheck:
+    """Test the cached, circuit-broken health check"""
+
+    def test_result_is_cached(self):
+        """A second check within the cache TTL doesn't hit the API"""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200)
+
+        client = make_client(handler)
+
+        assert asyncio.run(client.health_check()) is True
+        assert asyncio.run(client.health_check()) is True
+        assert len(requests) == 1
+
+    def test_breaker_opens_after_repeated_failures(self, monkeypatch):
+        """Consecutive failures open the breaker and stop further requests"""
+        import src.clients.riftbound_api as riftbound_api
+        monkeypatch.setattr(riftbound_api, "HEALTH_CACHE_TTL", 0.0)
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            raise httpx.ConnectError("connection refused", request=request)
+
+        client = make_client(handler)
+
+        for _ in range(riftbound_api.HEALTH_FAILURE_THRESHOLD + 2):
+            assert asyncio.run(client.health_check()) is False
+        assert len(requests) == riftbound_api.HEALTH_FAILURE_THRESHOLD